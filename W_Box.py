@@ -10,19 +10,24 @@ This file generates and modifies a box-shaped mesh.
 """
 
 import bpy
-import bmesh
 from bpy.props import (
     FloatProperty,
     IntProperty,
     BoolProperty,
     PointerProperty
 )
-from mathutils import (
-    Vector
-)
 from .gen_func import (
-    bridgeLoops,
-    create_mesh_object
+    create_mesh_object,
+    updateWMesh,
+    rememberTopology,
+    requestUpdate,
+    WParams
+)
+from .wmesh_core.box import (
+    primitive_Box,
+    topologyWBox,
+    previewWBox,
+    countsWBox
 )
 
 WBox_Defaults = {
@@ -36,127 +41,10 @@ WBox_Defaults = {
 }
 
 
-def primitive_Box(
-                size_x = 2.0,
-                size_y = 2.0,
-                size_z = 2.0,
-                seg_x = 1,
-                seg_y = 1,
-                seg_z = 1,
-                centered = True):
-
-    if seg_x < 1:
-        seg_x = 1
-    if seg_y < 1:
-        seg_y = 1
-    if seg_z < 1:
-        seg_z = 1
-
-    verts = []
-    edges = []
-    faces = []
-
-    bottom_lines = []
-    top_lines = []
-    loops = []
-
-    dist_x = size_x / seg_x
-    dist_y = size_y / seg_y
-    dist_z = size_z / seg_z
-
-    # bottom grid
-    for y in range(seg_y + 1):
-        line = []
-        for x in range(seg_x + 1):
-            line.append(len(verts))
-            verts.append(Vector((x * dist_x, y * dist_y, 0.0)))
-        bottom_lines.append(line)
-
-    # top grid
-    for y in range(seg_y + 1):
-        line = []
-        for x in range(seg_x + 1):
-            line.append(len(verts))
-            verts.append(Vector((x * dist_x, y * dist_y, size_z)))
-        top_lines.append(line)
-
-    # bottom loop
-    loop = []
-    for i in range(seg_x + 1):
-        loop.append(bottom_lines[0][i])
-    for i in range(seg_y - 1):
-        loop.append(bottom_lines[i + 1][- 1])
-    for i in range(seg_x + 1):
-        loop.append(bottom_lines[- 1][-(i + 1)])
-    for i in range(seg_y - 1):
-        loop.append(bottom_lines[-(i + 2)][0])
-    loops.append(loop)
-
-    # z loops
-    for z in range(seg_z - 1):
-        loop = []
-        for i in range(seg_x + 1):
-            loop.append(len(verts))
-            verts.append(Vector((i * dist_x, 0.0, (z + 1) * dist_z)))
-        for i in range(seg_y - 1):
-            loop.append(len(verts))
-            verts.append(Vector((size_x, (i + 1) * dist_y, (z + 1) * dist_z)))
-        for i in range(seg_x + 1):
-            loop.append(len(verts))
-            verts.append(Vector((
-                size_x - (i * dist_x), size_y, (z + 1) * dist_z)))
-        for i in range(seg_y - 1):
-            loop.append(len(verts))
-            verts.append(Vector((
-                0.0, size_y - ((i + 1) * dist_y), (z + 1) * dist_z)))
-        loops.append(loop)
-
-    # top loop
-    loop = []
-    for i in range(seg_x + 1):
-        loop.append(top_lines[0][i])
-    for i in range(seg_y - 1):
-        loop.append(top_lines[i + 1][-1])
-    for i in range(seg_x + 1):
-        loop.append(top_lines[-1][-(i + 1)])
-    for i in range(seg_y - 1):
-        loop.append(top_lines[-(i + 2)][0])
-    loops.append(loop)
-
-    # faces bottom
-    for i in range(seg_y):
-        faces.extend(bridgeLoops(bottom_lines[i+1], bottom_lines[i], False))
-
-    # faces top
-    for i in range(seg_y):
-        faces.extend(bridgeLoops(top_lines[i], top_lines[i + 1], False))
-
-    # faces sides
-    for i in range(seg_z):
-        faces.extend(bridgeLoops(loops[i], loops[i + 1], True))
-
-    if centered:
-        half_x = size_x / 2
-        half_y = size_y / 2
-        half_z = size_z / 2
-        for vertex in verts:
-            vertex -= Vector((half_x, half_y, half_z))
-
-    return verts, edges, faces
-
-
 def UpdateWBox(Wdata):
-    verts, edges, faces = primitive_Box(**Wdata["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(verts, edges, faces)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+    updateWMesh(
+        Wdata, primitive_Box, topologyWBox,
+        preview = previewWBox, counts = countsWBox)
 
 
 # Getters___________________________________________________________________
@@ -191,40 +79,40 @@ def getCentered(self):
 # Setters_____________________________________________________________________
 def setSizeX(self, val):
     self["animArgs"]["size_x"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setSizeY(self, val):
     self["animArgs"]["size_y"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setSizeZ(self, val):
     self["animArgs"]["size_z"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setSegX(self, val):
     self["animArgs"]["seg_x"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setSegY(self, val):
     self["animArgs"]["seg_y"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setSegZ(self, val):
     self["animArgs"]["seg_z"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
 def setCentered(self, val):
     self["animArgs"]["centered"] = val
-    UpdateWBox(self)
+    requestUpdate(self, UpdateWBox)
 
 
-class WBoxData(bpy.types.PropertyGroup):
+class WBoxData(WParams, bpy.types.PropertyGroup):
     size_x = FloatProperty(
         name = "X:",
         description = "Size of the WBox",
@@ -382,11 +270,12 @@ class Make_WBox(bpy.types.Operator):
         WBox_Defaults["seg_z"] = self.seg_z
         WBox_Defaults["centered"] = self.centered
 
-        verts, edges, faces = primitive_Box(**WBox_Defaults)
-        create_mesh_object(context, verts, edges, faces, "WBox")
+        geo = primitive_Box(**WBox_Defaults)
+        create_mesh_object(context, geo, "WBox")
 
         context.object.data.WType = 'WBOX'
         context.object.data.WBox["animArgs"] = WBox_Defaults
+        rememberTopology(context.object.data.WBox, topologyWBox)
         return {'FINISHED'}
 
 
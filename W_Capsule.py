@@ -10,12 +10,6 @@ This file generates and modifies a capsule-shaped mesh.
 """
 
 import bpy
-import bmesh
-from mathutils import (
-                    Vector,
-                    Quaternion
-)
-from math import pi as PI
 from bpy.props import (
                     BoolProperty,
                     IntProperty,
@@ -23,11 +17,17 @@ from bpy.props import (
                     PointerProperty
 )
 from .gen_func import (
-                    circleVerts as circ_V,
-                    moveVerts as move_V,
-                    fanClose,
-                    bridgeLoops,
-                    create_mesh_object as c_mesh
+                    create_mesh_object as c_mesh,
+                    updateWMesh,
+                    rememberTopology,
+                    requestUpdate,
+                    WParams
+)
+from .wmesh_core.capsule import (
+                    primitive_Capsule_ME,
+                    topologyWCapsule,
+                    previewWCapsule,
+                    countsWCapsule
 )
 
 WCapsule_Defaults = {
@@ -41,119 +41,11 @@ WCapsule_Defaults = {
 }
 
 
-# Generating the vertices and polygons
-def primitive_Capsule_ME(
-        radius = 0.5,
-        height = 2.0,
-        seg_perimeter = 24,
-        seg_height = 1,
-        seg_caps = 8,
-        centered = True,
-        smoothed = True):
-
-    # Prepare empty lists
-    verts = []
-    edges = []
-    faces = []
-
-    loops = []
-
-    # Set minimums
-    if seg_perimeter < 3:
-        seg_perimeter = 3
-    if seg_height < 1:
-        seg_height = 1
-    if seg_caps < 1:
-        seg_caps = 1
-    if radius > height / 2:
-        radius = height / 2
-
-    # Add top and bottom center vertices
-    verts.append(Vector((0, 0, 0)))
-    verts.append(Vector((0, 0, height)))
-
-    # Create bootom cap segmentation loops
-    if seg_caps > 1:
-        angleStep = PI / (2 * seg_caps)
-        for i in range(1, seg_caps):
-            # find the radius and height
-            quat = Quaternion((0, -1, 0), i * angleStep)
-            helperVect = quat * Vector((0, 0, -radius))
-            segmentRadius = helperVect.x
-            segmentHeight = radius + helperVect.z
-            # create the ring
-            newVerts, loop = circ_V(segmentRadius, seg_perimeter, len(verts))
-            move_V(newVerts, Vector((0, 0, segmentHeight)))
-            verts.extend(newVerts)
-            loops.append(loop)
-
-    # Create the base corner circle
-    newVerts, loop = circ_V(radius, seg_perimeter, len(verts))
-    move_V(newVerts, Vector((0, 0, radius)))
-    verts.extend(newVerts)
-    loops.append(loop)
-
-    # Create the side segmentation loops
-    if height > 2 * radius:
-        if seg_height > 1:
-            heightStep = (height - (2 * radius)) / seg_height
-            for i in range(1, seg_height):
-                newHeight = (i * heightStep) + radius
-                newVerts, loop = circ_V(radius, seg_perimeter, len(verts))
-                move_V(newVerts, Vector((0, 0, newHeight)))
-                verts.extend(newVerts)
-                loops.append(loop)
-
-    # Create top corner circle
-        newVerts, loop = circ_V(radius, seg_perimeter, len(verts))
-        move_V(newVerts, Vector((0, 0, height - radius)))
-        verts.extend(newVerts)
-        loops.append(loop)
-
-    # Create top cap segmentation loops
-    if seg_caps > 1:
-        angleStep = PI / (2 * seg_caps)
-        for i in range(1, seg_caps):
-            # find the radius and height
-            quat = Quaternion((0, -1, 0), i * angleStep)
-            helperVect = quat * Vector((radius, 0, 0))
-            segmentRadius = helperVect.x
-            segmentHeight = height - radius + helperVect.z
-            # create the ring
-            newVerts, loop = circ_V(segmentRadius, seg_perimeter, len(verts))
-            move_V(newVerts, Vector((0, 0, segmentHeight)))
-            verts.extend(newVerts)
-            loops.append(loop)
-
-    # Close caps
-    faces.extend(fanClose(loops[0], 0, flipped = True))
-    faces.extend(fanClose(loops[-1], 1))
-
-    # Bridge all loops
-    for i in range(1, len(loops)):
-        faces.extend(bridgeLoops(loops[i - 1], loops[i], True))
-
-    if centered:
-        move_V(verts, Vector((0, 0, -height / 2)))
-
-    return verts, edges, faces
-
-
 # Update functions
 def update_WCapsule_GEO(Wdata):
-    v, e, f = primitive_Capsule_ME(**Wdata["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(v, e, f)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    for fa in bm.faces:
-        fa.smooth = Wdata.smoothed
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+    updateWMesh(
+        Wdata, primitive_Capsule_ME, topologyWCapsule, Wdata.smoothed,
+        preview = previewWCapsule, counts = countsWCapsule)
 
 
 # getters
@@ -190,42 +82,42 @@ def setRadius(self, val):
     self["animArgs"]["radius"] = val
     if val > self["animArgs"]["height"] / 2:
         self["animArgs"]["height"] = 2 * val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setHeight(self, val):
     self["animArgs"]["height"] = val
     if val < self["animArgs"]["radius"] * 2:
         self["animArgs"]["radius"] = val / 2
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setSegPerim(self, val):
     self["animArgs"]["seg_perimeter"] = val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setSegHeight(self, val):
     self["animArgs"]["seg_height"] = val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setSegCaps(self, val):
     self["animArgs"]["seg_caps"] = val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setCentered(self, val):
     self["animArgs"]["centered"] = val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
 def setSmoothed(self, val):
     self["animArgs"]["smoothed"] = val
-    update_WCapsule_GEO(self)
+    requestUpdate(self, update_WCapsule_GEO)
 
 
-class WCapsuleData(bpy.types.PropertyGroup):
+class WCapsuleData(WParams, bpy.types.PropertyGroup):
 
     radius = FloatProperty(
         name = "Radius",
@@ -375,11 +267,12 @@ class Make_WCapsule(bpy.types.Operator):
         WCapsule_Defaults["seg_caps"] = self.seg_caps
         WCapsule_Defaults["centered"] = self.centered
 
-        verts, edges, faces = primitive_Capsule_ME(**WCapsule_Defaults)
-        c_mesh(context, verts, edges, faces, "WCapsule")
+        geo = primitive_Capsule_ME(**WCapsule_Defaults)
+        c_mesh(context, geo, "WCapsule")
 
         context.object.data.WType = 'WCAPSULE'
         context.object.data.WCapsule["animArgs"] = WCapsule_Defaults
+        rememberTopology(context.object.data.WCapsule, topologyWCapsule, True)
         bpy.ops.object.shade_smooth()
         context.object.data.use_auto_smooth = True
         return {'FINISHED'}
@@ -10,8 +10,6 @@ This file generates and modifies a cone-shaped mesh.
 """
 
 import bpy
-import bmesh
-from mathutils import Vector
 from bpy.props import (
     BoolProperty,
     IntProperty,
@@ -19,11 +17,17 @@ from bpy.props import (
     PointerProperty
 )
 from .gen_func import (
-    circleVerts as circ_V,
-    moveVerts as move_V,
-    fanClose,
-    bridgeLoops,
-    create_mesh_object as c_mesh
+    create_mesh_object as c_mesh,
+    updateWMesh,
+    rememberTopology,
+    requestUpdate,
+    WParams
+)
+from .wmesh_core.cone import (
+    primitive_Cone_ME,
+    topologyWCone,
+    previewWCone,
+    countsWCone
 )
 
 WCone_Defaults = {
@@ -38,111 +42,11 @@ WCone_Defaults = {
 }
 
 
-# Generating the vertices and polygons
-def primitive_Cone_ME(
-        radius_main = 1.0,
-        radius_top = 0.0,
-        height = 2.0,
-        seg_perimeter = 24,
-        seg_height = 1,
-        seg_radius = 1,
-        centered = False,
-        smoothed = True):
-
-    # Prepare empty lists
-    verts = []
-    edges = []
-    faces = []
-
-    loops = []
-
-    # Set minimums
-    if seg_perimeter < 3:
-        seg_perimeter = 3
-    if seg_height < 1:
-        seg_height = 1
-    if seg_radius < 1:
-        seg_radius = 1
-
-    # Add top and bottom center vertices
-    verts.append(Vector((0, 0, 0)))
-    verts.append(Vector((0, 0, height)))
-
-    if radius_top == 0 and radius_main == 0:
-        edges.append((0, 1))
-        return verts, edges, faces
-
-    # Create base segmentation loops
-    if radius_main > 0:
-        if seg_radius > 1:
-            step = radius_main / seg_radius
-            for i in range(1, seg_radius):
-                newVerts, loop = circ_V(i * step, seg_perimeter, len(verts))
-                verts.extend(newVerts)
-                loops.append(loop)
-
-        # Create the base corner circle
-        newVerts, loop = circ_V(radius_main, seg_perimeter, len(verts))
-        verts.extend(newVerts)
-        loops.append(loop)
-
-    # Create the side segmentation loops
-    if seg_height > 1:
-        heightStep = height / seg_height
-        radiusStep = (radius_top - radius_main) / seg_height
-        for i in range(1, seg_height):
-            newRadius = radius_main + (i * radiusStep)
-            newVerts, loop = circ_V(newRadius, seg_perimeter, len(verts))
-            move_V(newVerts, Vector((0, 0, heightStep * i)))
-            verts.extend(newVerts)
-            loops.append(loop)
-
-    # Create top corner circle
-    if radius_top > 0:
-        newVerts, loop = circ_V(radius_top, seg_perimeter, len(verts))
-        move_V(newVerts, Vector((0, 0, height)))
-        verts.extend(newVerts)
-        loops.append(loop)
-
-        # Create the top segmentation loops
-        if seg_radius > 1:
-            step = radius_top / seg_radius
-            for i in range(1, seg_radius):
-                newRadius = radius_top - (i * step)
-                newVerts, loop = circ_V(newRadius, seg_perimeter, len(verts))
-                move_V(newVerts, Vector((0, 0, height)))
-                verts.extend(newVerts)
-                loops.append(loop)
-
-    # Close caps
-    faces.extend(fanClose(loops[0], 0, closed = True, flipped = True))
-    faces.extend(fanClose(loops[-1], 1))
-
-    # Bridge all loops
-    for i in range(1, len(loops)):
-        faces.extend(bridgeLoops(loops[i - 1], loops[i], True))
-
-    if centered:
-        move_V(verts, Vector((0, 0, -height / 2)))
-
-    return verts, edges, faces
-
-
 # Update functions
 def update_WCone_GEO(Wdata):
-    v, e, f = primitive_Cone_ME(**Wdata["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(v, e, f)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    for fa in bm.faces:
-        fa.smooth = Wdata.smoothed
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+    updateWMesh(
+        Wdata, primitive_Cone_ME, topologyWCone, Wdata.smoothed,
+        preview = previewWCone, counts = countsWCone)
 
 
 # getters
@@ -181,45 +85,45 @@ def getSmoothed(self):
 # Setters _____________________________________________________________________
 def setRadTop(self, val):
     self["animArgs"]["radius_top"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setRadMain(self, val):
     self["animArgs"]["radius_main"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setHeight(self, val):
     self["animArgs"]["height"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setSegPerim(self, val):
     self["animArgs"]["seg_perimeter"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setSegHeight(self, val):
     self["animArgs"]["seg_height"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setSegRad(self, val):
     self["animArgs"]["seg_radius"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setCentered(self, val):
     self["animArgs"]["centered"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
 def setSmoothed(self, val):
     self["animArgs"]["smoothed"] = val
-    update_WCone_GEO(self)
+    requestUpdate(self, update_WCone_GEO)
 
 
-class WConeData(bpy.types.PropertyGroup):
+class WConeData(WParams, bpy.types.PropertyGroup):
 
     rad_top = FloatProperty(
         name = "Radius top",
@@ -409,11 +313,12 @@ class Make_WCone(bpy.types.Operator):
         WCone_Defaults["seg_radius"] = self.seg_radius
         WCone_Defaults["centered"] = self.centered
 
-        verts, edges, faces = primitive_Cone_ME(**WCone_Defaults)
-        c_mesh(context, verts, edges, faces, "WCone")
+        geo = primitive_Cone_ME(**WCone_Defaults)
+        c_mesh(context, geo, "WCone")
 
         context.object.data.WType = 'WCONE'
         context.object.data.WCone["animArgs"] = WCone_Defaults
+        rememberTopology(context.object.data.WCone, topologyWCone, True)
         bpy.ops.object.shade_smooth()
         context.object.data.use_auto_smooth = True
         return {'FINISHED'}
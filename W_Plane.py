@@ -6,15 +6,25 @@
 # __________________________________/
 
 import bpy
-import bmesh
 from bpy.props import (
     FloatProperty,
     IntProperty,
     BoolProperty,
     PointerProperty
 )
-from mathutils import Vector
-from .gen_func import bridgeLoops, create_mesh_object
+from .gen_func import (
+    create_mesh_object,
+    updateWMesh,
+    rememberTopology,
+    requestUpdate,
+    WParams
+)
+from .wmesh_core.plane import (
+    WPlane_mesh,
+    topologyWPlane,
+    previewWPlane,
+    countsWPlane
+)
 
 WPlane_Defaults = {
     "size_x": 2.0,
@@ -25,54 +35,10 @@ WPlane_Defaults = {
 }
 
 
-def WPlane_mesh(
-        size_x = 2.0,
-        size_y = 2.0,
-        seg_x = 1,
-        seg_y = 1,
-        centered = True):
-
-    verts = []
-    edges = []
-    faces = []
-
-    lines = []
-
-    dist_x = size_x / seg_x
-    dist_y = size_y / seg_y
-
-    for i in range(seg_y + 1):
-        line = []
-        for j in range(seg_x + 1):
-            line.append(len(verts))
-            verts.append(Vector((j * dist_x, i * dist_y, 0.0)))
-        lines.append(line)
-
-    for i in range(len(lines) - 1):
-        faces.extend(bridgeLoops(lines[i], lines[i + 1], False))
-
-    if centered:
-        half_x = size_x / 2
-        half_y = size_y / 2
-        for vertex in verts:
-            vertex[0] -= half_x
-            vertex[1] -= half_y
-
-    return verts, edges, faces
-
-
 def UpdateWPlane(Wdata):
-    verts, edges, faces = WPlane_mesh(**Wdata["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(verts, edges, faces)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+    updateWMesh(
+        Wdata, WPlane_mesh, topologyWPlane,
+        preview = previewWPlane, counts = countsWPlane)
 
 
 # Getters______________________________________________________________________
@@ -99,30 +65,30 @@ def getCentered(self):
 # Setters______________________________________________________________________
 def setX(self, val):
     self["animArgs"]["size_x"] = val
-    UpdateWPlane(self)
+    requestUpdate(self, UpdateWPlane)
 
 
 def setY(self, val):
     self["animArgs"]["size_y"] = val
-    UpdateWPlane(self)
+    requestUpdate(self, UpdateWPlane)
 
 
 def setSegX(self, val):
     self["animArgs"]["seg_x"] = val
-    UpdateWPlane(self)
+    requestUpdate(self, UpdateWPlane)
 
 
 def setSegY(self, val):
     self["animArgs"]["seg_y"] = val
-    UpdateWPlane(self)
+    requestUpdate(self, UpdateWPlane)
 
 
 def setCentered(self, val):
     self["animArgs"]["centered"] = val
-    UpdateWPlane(self)
+    requestUpdate(self, UpdateWPlane)
 
 
-class WPlaneData(bpy.types.PropertyGroup):
+class WPlaneData(WParams, bpy.types.PropertyGroup):
     size_x = FloatProperty(
         name = "X",
         description = "Size of the WPlane",
@@ -244,11 +210,12 @@ class Make_WPlane(bpy.types.Operator):
         WPlane_Defaults["seg_y"] = self.seg_y
         WPlane_Defaults["centered"] = self.centered
 
-        verts, edges, faces = WPlane_mesh(**WPlane_Defaults)
-        create_mesh_object(context, verts, edges, faces, "WPlane")
+        geo = WPlane_mesh(**WPlane_Defaults)
+        create_mesh_object(context, geo, "WPlane")
 
         context.object.data.WType = 'WPLANE'
         context.object.data.WPlane["animArgs"] = WPlane_Defaults
+        rememberTopology(context.object.data.WPlane, topologyWPlane)
         return {'FINISHED'}
 
 
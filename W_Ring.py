@@ -10,15 +10,25 @@ This file generates and modifies a ring-shaped mesh.
 """
 
 import bpy
-import bmesh
 from bpy.props import (
                 FloatProperty,
                 IntProperty,
                 BoolProperty,
                 PointerProperty
 )
-from mathutils import Quaternion, Vector
-from .gen_func import bridgeLoops, create_mesh_object
+from .gen_func import (
+    create_mesh_object,
+    updateWMesh,
+    rememberTopology,
+    requestUpdate,
+    WParams
+)
+from .wmesh_core.ring import (
+    primitive_Ring,
+    topologyWRing,
+    previewWRing,
+    countsWRing
+)
 from math import pi
 
 WRing_Defaults = {
@@ -32,94 +42,10 @@ WRing_Defaults = {
 }
 
 
-def primitive_Ring(
-                radius_out = 1.0,
-                use_inner = True,
-                radius_in = 0.0,
-                seg_perimeter = 24,
-                seg_radius = 1,
-                sector_from = 0.0,
-                sector_to = 2 * pi):
-
-    verts = []
-    edges = []
-    faces = []
-
-    loops = []
-
-    # make sure of what is bigger
-    if radius_out < radius_in:
-        radius_in, radius_out = radius_out, radius_in
-
-    if sector_from > sector_to:
-        sector_to, sector_from = sector_from, sector_to
-
-    if (radius_out - radius_in) < 0.0001:
-        use_inner = False
-
-    if seg_perimeter < 3:
-        seg_perimeter = 3
-
-    stepAngle = (sector_to - sector_from) / seg_perimeter
-    stepRadius = (radius_out - radius_in) / seg_radius
-
-    loop_number = seg_radius
-    if radius_in > 0.0001:
-        loop_number = seg_radius + 1
-
-    seg_number = seg_perimeter
-    closed = True
-    if sector_to - sector_from < (2 * pi):
-        seg_number = seg_perimeter + 1
-        closed = False
-
-    if use_inner:
-        for r in range(loop_number):
-            loop = []
-            for s in range(seg_number):
-                loop.append(len(verts))
-                quat = Quaternion((0, 0, 1), (s * stepAngle) + sector_from)
-                verts.append(quat * Vector((
-                    radius_out - (r * stepRadius), 0.0, 0.0)))
-            loops.append(loop)
-
-        # fill the loops
-        for i in range(len(loops) - 1):
-            faces.extend(bridgeLoops(loops[i], loops[i + 1], closed))
-
-        # one point in the middle
-        if loop_number == seg_radius:
-            verts.append(Vector((0.0, 0.0, 0.0)))
-            for s in range(seg_number - 1):
-                faces.append((loops[-1][s], loops[-1][s+1], len(verts) - 1))
-            if seg_number == seg_perimeter:
-                faces.append((loops[-1][-1], loops[-1][0], len(verts) - 1))
-
-    else:
-        for s in range(seg_number):
-            quat = Quaternion((0, 0, 1), (s * stepAngle) + sector_from)
-            verts.append(quat * Vector((radius_out, 0.0, 0.0)))
-
-        for v in range(len(verts) - 1):
-            edges.append((v, v + 1))
-        if closed:
-            edges.append((len(verts) - 1, 0))
-
-    return verts, edges, faces
-
-
 def UpdateWRing(WData):
-    verts, edges, faces = primitive_Ring(**WData["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(verts, edges, faces)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    bm.to_mesh(WData.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    WData.id_data.update()
+    updateWMesh(
+        WData, primitive_Ring, topologyWRing,
+        preview = previewWRing, counts = countsWRing)
 
 
 # Getters______________________________________________________________________
@@ -154,40 +80,40 @@ def getSector_to(self):
 # Setters______________________________________________________________________
 def setRadius_out(self, val):
     self["animArgs"]["radius_out"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setUse_inner(self, val):
     self["animArgs"]["use_inner"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setRadius_in(self, val):
     self["animArgs"]["radius_in"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setSeg_perimeter(self, val):
     self["animArgs"]["seg_perimeter"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setSeg_radius(self, val):
     self["animArgs"]["seg_radius"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setSector_from(self, val):
     self["animArgs"]["sector_from"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
 def setSector_to(self, val):
     self["animArgs"]["sector_to"] = val
-    UpdateWRing(self)
+    requestUpdate(self, UpdateWRing)
 
 
-class WRingData(bpy.types.PropertyGroup):
+class WRingData(WParams, bpy.types.PropertyGroup):
     radius_out = FloatProperty(
         name="Outer",
         description="Outer radius",
@@ -366,11 +292,12 @@ class Make_WRing(bpy.types.Operator):
         WRing_Defaults["sector_from"] = self.sector_from
         WRing_Defaults["sector_to"] = self.sector_to
 
-        verts, edges, faces = primitive_Ring(**WRing_Defaults)
-        create_mesh_object(context, verts, edges, faces, "WRing")
+        geo = primitive_Ring(**WRing_Defaults)
+        create_mesh_object(context, geo, "WRing")
 
         context.object.data.WType = 'WRING'
         context.object.data.WRing["animArgs"] = WRing_Defaults
+        rememberTopology(context.object.data.WRing, topologyWRing)
 
         return {'FINISHED'}
 
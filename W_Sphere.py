@@ -10,7 +10,6 @@ This file generates and modifies a sphere-shaped mesh.
 """
 
 import bpy
-import bmesh
 from bpy.props import (
     FloatProperty,
     IntProperty,
@@ -18,10 +17,26 @@ from bpy.props import (
     EnumProperty,
     BoolProperty
 )
-from mathutils import Vector, Quaternion
-from math import pi
-from .gen_func import bridgeLoops, create_mesh_object, subdivide
-from .W_Bases import baseHedron
+import numpy as np
+from .gen_func import (
+    create_mesh_object,
+    updateWMesh,
+    rememberTopology,
+    requestUpdate,
+    WParams,
+    writePositions,
+    asyncUpdatePending,
+    fullUpdates
+)
+from .wmesh_core.sphere import (
+    primitive_UVSphere,
+    primitive_polySphere,
+    primitive_geoSphere,
+    primitive_Sphere,
+    topologyWSphere,
+    previewWSphere,
+    countsWSphere
+)
 
 WSphere_defaults = {
     "radius": 1.0,
@@ -30,126 +45,40 @@ WSphere_defaults = {
     "base": 3,
     "divisions": 2,
     "tris": False,
+    "geodesic": False,
+    "frequency": 4,
     "smoothed": True
 }
 
 
-def primitive_UVSphere(
-                radius = 1.0,
-                segments = 24,
-                rings = 12):
-
-    verts = []
-    edges = []
-    faces = []
-
-    loops = []
-
-    # create top and bottom verts
-    verts.append(Vector((0.0, 0.0, radius)))
-    verts.append(Vector((0.0, 0.0, -radius)))
-
-    # calculate angles
-    UAngle = (2*pi)/segments
-    VAngle = pi/rings
-
-    # create rings
-    for v in range(rings - 1):
-        loop = []
-        quatV = Quaternion((0, -1, 0), VAngle * (v + 1))
-        baseVect = quatV * Vector((0.0, 0.0, -radius))
-        for u in range(segments):
-            loop.append(len(verts))
-            quatU = Quaternion((0, 0, 1), UAngle * u)
-            verts.append(quatU * baseVect)
-        loops.append(loop)
-
-    # create faces
-    for i in range(rings - 2):
-        faces.extend(bridgeLoops(loops[i], loops[i + 1], True))
-
-    # fill top
-    ring = loops[-1]
-    for i in range(segments):
-        if (i == segments - 1):
-            faces.append((ring[i], ring[0], 0))
-        else:
-            faces.append((ring[i], ring[i + 1], 0))
-
-    # fill bottom
-    ring = loops[0]
-    for i in range(segments):
-        if (i == segments - 1):
-            faces.append((ring[0], ring[i], 1))
-        else:
-            faces.append((ring[i + 1], ring[i], 1))
-
-    return verts, edges, faces
-
-
-def primitive_polySphere(
-                    base = "CUBE",
-                    radius = 1.0,
-                    divisions = 2,
-                    tris = True):
-
-    verts, edges, faces = baseHedron(base)
-
-    for vert in verts:
-        vert.normalize()
-        vert *= radius
-
-    if base == "CUBE":
-        tris = False
-
-    for i in range(divisions):
-        verts, edges, faces = subdivide(verts, edges, faces, tris)
+def UpdateWSphere(Wdata):
+    updateWMesh(
+        Wdata, primitive_Sphere, topologyWSphere, Wdata.smoothed,
+        preview = previewWSphere, counts = countsWSphere)
 
-        # normalize
-        for vert in verts:
-            vert.normalize()
-            vert *= radius
 
-    return verts, edges, faces
+def Update_Size(Wdata):
+    radius = Wdata["animArgs"]["radius"]
+    mesh = Wdata.id_data
 
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords = coords.reshape(-1, 3)
+    lengths = np.linalg.norm(coords, axis = 1)
 
-def UpdateWSphere(Wdata):
-    WData = Wdata["animArgs"]
-
-    if WData["base"] == 1:
-        verts, edges, faces = primitive_UVSphere(
-            radius = WData["radius"],
-            segments = WData["segments"],
-            rings = WData["rings"]
-        )
-    else:
-        bases = ["TETRA", "CUBE", "OCTA", "ICOSA"]
-        verts, edges, faces = primitive_polySphere(
-            base = bases[WData["base"] - 2],
-            radius = WData["radius"],
-            divisions = WData["divisions"],
-            tris = WData["tris"]
-        )
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(verts, edges, faces)
-    tmpMesh.update()
-
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    for fa in bm.faces:
-        fa.smooth = Wdata.smoothed
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+    # a sphere of zero size lost its shape, it has to be generated again,
+    # a mesh still being generated would get the old radius back and a
+    # blocked one is not the sphere of the animArgs
+    if (not lengths.all() or asyncUpdatePending(Wdata) or
+            "blockedVerts" in Wdata):
+        UpdateWSphere(Wdata)
+        return
 
+    coords *= (radius / lengths)[:, np.newaxis]
+    writePositions(mesh, coords)
 
-def Update_Size(Wdata):
-    radius = Wdata["animArgs"]["radius"]
 
-    for vert in Wdata.id_data.vertices:
-        vert.co.normalize()
-        vert.co *= radius
+fullUpdates[Update_Size] = UpdateWSphere
 
 
 class Make_WSphere(bpy.types.Operator):
@@ -225,6 +154,22 @@ class Make_WSphere(bpy.types.Operator):
         default=False
     )
 
+    geodesic = BoolProperty(
+        name="Geodesic",
+        description="Divide every face of the base into a grid at once",
+        default=False
+    )
+
+    frequency = IntProperty(
+        name="Frequency",
+        description="Segments on every edge of the base",
+        default=4,
+        min=1,
+        soft_min=1,
+        step=1,
+        subtype='NONE'
+    )
+
     def execute(self, context):
 
         """
@@ -235,6 +180,8 @@ class Make_WSphere(bpy.types.Operator):
         "base": 3,
         "divisions": 2,
         "tris": False,
+        "geodesic": False,
+        "frequency": 4,
         "smoothed": True
         """
 
@@ -244,27 +191,36 @@ class Make_WSphere(bpy.types.Operator):
         WSphere_defaults["base"] = self.base
         WSphere_defaults["divisions"] = self.divisions
         WSphere_defaults["tris"] = self.tris
+        WSphere_defaults["geodesic"] = self.geodesic
+        WSphere_defaults["frequency"] = self.frequency
         WSphere_defaults["smoothed"] = self.smoothed
 
         #verts, edges, faces = primitive_polySphere(**WSphere_defaults)
 
         if self.base == "UV":
-            verts, edges, faces = primitive_UVSphere(
+            geo = primitive_UVSphere(
                 radius = WSphere_defaults["radius"],
                 segments = WSphere_defaults["segments"],
                 rings = WSphere_defaults["rings"]
             )
+        elif self.geodesic:
+            geo = primitive_geoSphere(
+                base = WSphere_defaults["base"],
+                radius = WSphere_defaults["radius"],
+                frequency = WSphere_defaults["frequency"]
+            )
         else:
-            verts, edges, faces = primitive_polySphere(
+            geo = primitive_polySphere(
                 base = WSphere_defaults["base"],
                 radius = WSphere_defaults["radius"],
                 divisions = WSphere_defaults["divisions"],
                 tris = WSphere_defaults["tris"]
             )
 
-        create_mesh_object(context, verts, edges, faces, "WSphere")
+        create_mesh_object(context, geo, "WSphere")
 
         context.object.data.WSphere["animArgs"] = WSphere_defaults
+        rememberTopology(context.object.data.WSphere, topologyWSphere, True)
 
         context.object.data.WType = 'WSPHERE'
         bpy.ops.object.shade_smooth()
@@ -300,43 +256,63 @@ def getTris(self):
     return self["animArgs"]["tris"]
 
 
+# WSpheres made before the geodesic mode do not have it in the animArgs
+def getGeodesic(self):
+    return self["animArgs"].get("geodesic", False)
+
+
+def getFrequency(self):
+    return self["animArgs"].get("frequency", 4)
+
+
 # setters_____________________________________________________________________
 def setRadius(self, val):
     self["animArgs"]["radius"] = val
-    Update_Size(self)
+    requestUpdate(self, Update_Size)
 
 
 def setSegments(self, val):
     self["animArgs"]["segments"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
 
 
 def setRing(self, val):
     self["animArgs"]["rings"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
 
 
 def setDivisions(self, val):
     self["animArgs"]["divisions"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
 
 
 def setBase(self, val):
     self["animArgs"]["base"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
 
 
 def setSmoothed(self, val):
     self["animArgs"]["smoothed"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
 
 
 def setTris(self, val):
     self["animArgs"]["tris"] = val
-    UpdateWSphere(self)
+    requestUpdate(self, UpdateWSphere)
+
 
+def setGeodesic(self, val):
+    self["animArgs"]["geodesic"] = val
+    self["animArgs"]["frequency"] = getFrequency(self)
+    requestUpdate(self, UpdateWSphere)
 
-class WSphereData(bpy.types.PropertyGroup):
+
+def setFrequency(self, val):
+    self["animArgs"]["frequency"] = val
+    requestUpdate(self, UpdateWSphere)
+
+
+class WSphereData(WParams, bpy.types.PropertyGroup):
     radius = FloatProperty(
         name="Radius",
         description="Radius of the Sphere",
@@ -418,6 +394,26 @@ class WSphereData(bpy.types.PropertyGroup):
         get = getTris
     )
 
+    geodesic = BoolProperty(
+        name="Geodesic",
+        description="Divide every face of the base into a grid at once",
+        default=False,
+        set = setGeodesic,
+        get = getGeodesic
+    )
+
+    frequency = IntProperty(
+        name="Frequency",
+        description="Segments on every edge of the base",
+        default=4,
+        min=1,
+        soft_min=1,
+        step=1,
+        subtype='NONE',
+        set = setFrequency,
+        get = getFrequency
+    )
+
 
 def drawWSpherePanel(self, context):
     lay_out = self.layout
@@ -431,9 +427,13 @@ def drawWSpherePanel(self, context):
     if (WData.base == 'UV'):
         col.prop(WData, "segments")
         col.prop(WData, "rings")
-    elif (WData.base != 'UV'):
+    elif (WData.geodesic):
+        col.prop(WData, "frequency")
+        col.prop(WData, "geodesic")
+    else:
         col.prop(WData, "divisions")
         col.prop(WData, "tris")
+        col.prop(WData, "geodesic")
 
     lay_out.prop(WData, "smoothed")
 
@@ -10,11 +10,6 @@ This file generates and modifies a torus-shaped mesh.
 """
 
 import bpy
-import bmesh
-from mathutils import (
-                    Vector,
-                    Quaternion
-)
 from math import pi as PI
 from bpy.props import (
                     BoolProperty,
@@ -23,12 +18,21 @@ from bpy.props import (
                     PointerProperty
 )
 from .gen_func import (
-                    circleVerts as circ_V,
-                    moveVerts as move_V,
-                    rotateVerts as rot_V,
-                    fanClose,
-                    bridgeLoops,
-                    create_mesh_object as c_mesh
+                    create_mesh_object as c_mesh,
+                    updateWMesh,
+                    rememberTopology,
+                    requestUpdate,
+                    writePositions,
+                    asyncUpdatePending,
+                    fullUpdates,
+                    WParams
+)
+from .wmesh_core.torus import (
+                    primitive_Torus_ME,
+                    torusBasis,
+                    topologyWTorus,
+                    previewWTorus,
+                    countsWTorus
 )
 
 WTorus_Defaults = {
@@ -42,86 +46,35 @@ WTorus_Defaults = {
 }
 
 
-# Generating the vertices and polygons
-def primitive_Torus_ME(
-        radius_main = 2.0,
-        radius_minor = 0.5,
-        seg_main = 24,
-        seg_minor = 12,
-        sec_from = 0.0,
-        sec_to = 2 * PI,
-        smoothed = True):
-
-    # Prepare empty lists
-    verts = []
-    edges = []
-    faces = []
-
-    loops = []
-
-    # Set minimums
-    if seg_main < 3:
-        seg_main = 3
-    if seg_minor < 3:
-        seg_minor = 3
-    if sec_from > sec_to:
-        sec_from, sec_to = sec_to, sec_from
-
-    # Create the loops
-    seg_angle = (sec_to - sec_from) / seg_main
-    quatRight = Quaternion((-1, 0, 0), PI / 2)
-    vecOffset = Vector((radius_main, 0, 0))
-    for i in range(seg_main):
-        quat = Quaternion((0, 0, 1), (i * seg_angle) + sec_from)
-        newVerts, loop = circ_V(radius_minor, seg_minor, len(verts))
-        rot_V(newVerts, quatRight)
-        move_V(newVerts, vecOffset)
-        rot_V(newVerts, quat)
-        verts.extend(newVerts)
-        loops.append(loop)
-
-    # Close the shape
-    if sec_to - sec_from < 2 * PI:
-        quat = Quaternion((0, 0, 1), sec_to)
-        newVerts, loop = circ_V(radius_minor, seg_minor, len(verts))
-        rot_V(newVerts, quatRight)
-        move_V(newVerts, vecOffset)
-        rot_V(newVerts, quat)
-        verts.extend(newVerts)
-        loops.append(loop)
-
-        verts.append(quat * vecOffset)
-        quat = Quaternion((0, 0, 1), sec_from)
-        verts.append(quat * vecOffset)
-
-        # Close caps
-        faces.extend(fanClose(loops[0], len(verts) - 1, flipped = True))
-        faces.extend(fanClose(loops[-1], len(verts) - 2))
-    else:
-        faces.extend(bridgeLoops(loops[-1], loops[0], True))
-
-    # Bridge all loops
-    for i in range(1, len(loops)):
-        faces.extend(bridgeLoops(loops[i - 1], loops[i], True))
-
-    return verts, edges, faces
-
-
 # Update functions
 def update_WTorus_GEO(Wdata):
-    v, e, f = primitive_Torus_ME(**Wdata["animArgs"])
-    tmpMesh = bpy.data.meshes.new("TemporaryMesh")
-    tmpMesh.from_pydata(v, e, f)
-    tmpMesh.update()
+    updateWMesh(
+        Wdata, primitive_Torus_ME, topologyWTorus, Wdata.smoothed,
+        preview = previewWTorus, counts = countsWTorus)
+
+
+def update_WTorus_Radius(Wdata):
+    args = Wdata["animArgs"].to_dict()
+    mesh = Wdata.id_data
+
+    # only the positions change while the topology of the mesh is the one
+    # of the animArgs, a mesh being generated or blocked is regenerated
+    if (Wdata.get("topology") != repr(topologyWTorus(args)) or
+            asyncUpdatePending(Wdata) or "blockedVerts" in Wdata):
+        update_WTorus_GEO(Wdata)
+        return
+
+    outer, tube = torusBasis(args)
+    if len(outer) != len(mesh.vertices):
+        update_WTorus_GEO(Wdata)
+        return
+
+    coords = outer * args["radius_main"]
+    coords += tube * (args["radius_minor"] - args["radius_main"])
+    writePositions(mesh, coords)
+
 
-    bm = bmesh.new()
-    bm.from_mesh(tmpMesh)
-    for fa in bm.faces:
-        fa.smooth = Wdata.smoothed
-    bm.to_mesh(Wdata.id_data)
-    bm.free()
-    bpy.data.meshes.remove(tmpMesh)
-    Wdata.id_data.update()
+fullUpdates[update_WTorus_Radius] = update_WTorus_GEO
 
 
 # getters
@@ -168,54 +121,54 @@ def setRadMain(self, val):
     self["animArgs"]["radius_main"] = val
     if val < self["animArgs"]["radius_minor"]:
         self["animArgs"]["radius_minor"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_Radius)
 
 
 def setRadMin(self, val):
     self["animArgs"]["radius_minor"] = val
     if val > self["animArgs"]["radius_main"]:
         self["animArgs"]["radius_main"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_Radius)
 
 
 def setRadIn(self, val):
     self["animArgs"]["radius_main"] = (val + self.radius_out) / 2
     self["animArgs"]["radius_minor"] = self["animArgs"]["radius_main"] - val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_Radius)
 
 
 def setRadOut(self, val):
     self["animArgs"]["radius_main"] = (self.radius_in + val) / 2
     self["animArgs"]["radius_minor"] = val - self["animArgs"]["radius_main"]
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_Radius)
 
 
 def setSegMain(self, val):
     self["animArgs"]["seg_main"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_GEO)
 
 
 def setSegMin(self, val):
     self["animArgs"]["seg_minor"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_GEO)
 
 
 def setSecFrom(self, val):
     self["animArgs"]["sec_from"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_GEO)
 
 
 def setSecTo(self, val):
     self["animArgs"]["sec_to"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_GEO)
 
 
 def setSmoothed(self, val):
     self["animArgs"]["smoothed"] = val
-    update_WTorus_GEO(self)
+    requestUpdate(self, update_WTorus_GEO)
 
 
-class WTorusData(bpy.types.PropertyGroup):
+class WTorusData(WParams, bpy.types.PropertyGroup):
 
     radius_main = FloatProperty(
         name = "Major",
@@ -444,11 +397,12 @@ class Make_WTorus(bpy.types.Operator):
         WTorus_Defaults["sec_to"] = self.sec_to
         WTorus_Defaults["smoothed"] = self.smoothed
 
-        verts, edges, faces = primitive_Torus_ME(**WTorus_Defaults)
-        c_mesh(context, verts, edges, faces, "WTorus")
+        geo = primitive_Torus_ME(**WTorus_Defaults)
+        c_mesh(context, geo, "WTorus")
 
         context.object.data.WType = 'WTORUS'
         context.object.data.WTorus["animArgs"] = WTorus_Defaults
+        rememberTopology(context.object.data.WTorus, topologyWTorus, True)
         bpy.ops.object.shade_smooth()
         context.object.data.use_auto_smooth = True
         context.object.data.auto_smooth_angle = PI / 3
@@ -16,18 +16,178 @@ bl_info = {
         }
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.props import (
-    EnumProperty
+    EnumProperty,
+    BoolProperty,
+    FloatProperty,
+    IntProperty
 )
-from .W_Plane import registerWPlane, unregisterWPlane, drawWPlanePanel
-from .W_Box import registerWBox, unregisterWBox, drawWBoxPanel
-from .W_Ring import registerWRing, unregisterWRing, drawWRingPanel
-from .W_Tube import registerWTube, unregisterWTube, drawWTubePanel
-from .W_Sphere import registerWSphere, unregisterWSphere, drawWSpherePanel
-from .W_Screw import registerWScrew, unregisterWScrew, drawWScrewPanel
-from .W_Cone import registerWCone, unregisterWCone, drawWConePanel
-from .W_Capsule import registerWCapsule, unregisterWCapsule, drawWCapsulePanel
-from .W_Torus import registerWTorus, unregisterWTorus, drawWTorusPanel
+from .gen_func import flushUpdates, stopAsyncUpdates, stopTimers
+from .W_Plane import (
+    registerWPlane, unregisterWPlane, drawWPlanePanel, UpdateWPlane)
+from .W_Box import registerWBox, unregisterWBox, drawWBoxPanel, UpdateWBox
+from .W_Ring import (
+    registerWRing, unregisterWRing, drawWRingPanel, UpdateWRing)
+from .W_Tube import (
+    registerWTube, unregisterWTube, drawWTubePanel, UpdateWTube)
+from .W_Sphere import (
+    registerWSphere, unregisterWSphere, drawWSpherePanel, UpdateWSphere)
+from .W_Screw import (
+    registerWScrew, unregisterWScrew, drawWScrewPanel, UpdateWScrew)
+from .W_Cone import (
+    registerWCone, unregisterWCone, drawWConePanel, update_WCone_GEO)
+from .W_Capsule import (
+    registerWCapsule, unregisterWCapsule, drawWCapsulePanel,
+    update_WCapsule_GEO)
+from .W_Torus import (
+    registerWTorus, unregisterWTorus, drawWTorusPanel, update_WTorus_GEO)
+
+
+class WPreferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    deferred_updates = BoolProperty(
+        name = "Deferred updates",
+        description = "Regenerate WMeshes once per UI tick",
+        default = True
+    )
+
+    async_updates = BoolProperty(
+        name = "Generate in background",
+        description = "Generate WMeshes in a worker thread",
+        default = False
+    )
+
+    update_interval = FloatProperty(
+        name = "Update interval",
+        description = "Minimum time between two regenerations of a WMesh",
+        default = 0.0,
+        min = 0.0,
+        soft_max = 1.0,
+        step = 1,
+        unit = 'TIME'
+    )
+
+    preview_delay = FloatProperty(
+        name = "Preview delay",
+        description = (
+            "Changes closer than this are previewed at a lower resolution"),
+        default = 0.25,
+        min = 0.0,
+        soft_max = 2.0,
+        step = 1,
+        unit = 'TIME'
+    )
+
+    preview_wplane = IntProperty(
+        name = "WPlane",
+        description = (
+            "Vertex budget of the WPlane previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wbox = IntProperty(
+        name = "WBox",
+        description = (
+            "Vertex budget of the WBox previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wscrew = IntProperty(
+        name = "WScrew",
+        description = (
+            "Vertex budget of the WScrew previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wring = IntProperty(
+        name = "WRing",
+        description = (
+            "Vertex budget of the WRing previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wtube = IntProperty(
+        name = "WTube",
+        description = (
+            "Vertex budget of the WTube previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wsphere = IntProperty(
+        name = "WSphere",
+        description = (
+            "Vertex budget of the WSphere previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wcone = IntProperty(
+        name = "WCone",
+        description = (
+            "Vertex budget of the WCone previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wcapsule = IntProperty(
+        name = "WCapsule",
+        description = (
+            "Vertex budget of the WCapsule previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    preview_wtorus = IntProperty(
+        name = "WTorus",
+        description = (
+            "Vertex budget of the WTorus previews, 0 disables them"),
+        default = 20000,
+        min = 0,
+        soft_max = 1000000,
+        step = 1000
+    )
+
+    def draw(self, context):
+        row = self.layout.row()
+        row.prop(self, "deferred_updates")
+        row.prop(self, "async_updates")
+        row = self.layout.row()
+        row.prop(self, "update_interval")
+        row.prop(self, "preview_delay")
+        self.layout.label("Preview vertices:")
+        flow = self.layout.column_flow(columns = 3)
+        for WType in (
+                'WPLANE', 'WBOX', 'WRING', 'WSPHERE', 'WTUBE', 'WCONE',
+                'WCAPSULE', 'WTORUS', 'WSCREW'):
+            flow.prop(self, "preview_" + WType.lower())
+
+
+@persistent
+def flushUpdatesHandler(*args):
+    flushUpdates()
 
 
 class WAddMenu(bpy.types.Menu):
@@ -81,10 +241,57 @@ class ConvertWMesh(bpy.types.Operator):
     bl_options = {'UNDO', 'REGISTER'}
 
     def execute(self, context):
+        flushUpdates()
         context.object.data.WType = 'NONE'
         return {'FINISHED'}
 
 
+# WType -> name of the WData pointer of the mesh
+WDataNames = {
+    'WPLANE': "WPlane",
+    'WBOX': "WBox",
+    'WSCREW': "WScrew",
+    'WRING': "WRing",
+    'WTUBE': "WTube",
+    'WSPHERE': "WSphere",
+    'WCONE': "WCone",
+    'WCAPSULE': "WCapsule",
+    'WTORUS': "WTorus"
+}
+
+# WType -> function regenerating the mesh from its WData
+WUpdates = {
+    'WPLANE': UpdateWPlane,
+    'WBOX': UpdateWBox,
+    'WSCREW': UpdateWScrew,
+    'WRING': UpdateWRing,
+    'WTUBE': UpdateWTube,
+    'WSPHERE': UpdateWSphere,
+    'WCONE': update_WCone_GEO,
+    'WCAPSULE': update_WCapsule_GEO,
+    'WTORUS': update_WTorus_GEO
+}
+
+
+class GenerateWMesh(bpy.types.Operator):
+    """Generate the WMesh even if it is over the vertex limit"""
+    bl_idname = "mesh.generate_w_mesh"
+    bl_label = "Generate Anyway"
+    bl_options = {'UNDO', 'REGISTER'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        mesh = context.object.data
+        WData = getattr(mesh, WDataNames[mesh.WType])
+        if "blockedVerts" not in WData:
+            return {'CANCELLED'}
+        WData["allowedVerts"] = WData["blockedVerts"]
+        WUpdates[mesh.WType](WData)
+        return {'FINISHED'}
+
+
 class WEditPanel(bpy.types.Panel):
     """Creates a Panel in the data context of the properties editor"""
     bl_label = "WMesh data"
@@ -123,6 +330,13 @@ class WEditPanel(bpy.types.Panel):
                 drawWCapsulePanel(self, context)
             elif WType == 'WTORUS':
                 drawWTorusPanel(self, context)
+            WData = getattr(obj.data, WDataNames[WType])
+            if "blockedVerts" in WData:
+                box = lay_out.box()
+                box.label(
+                    "Not generated: %d vertices" % WData["blockedVerts"],
+                    icon='ERROR')
+                box.operator(operator="mesh.generate_w_mesh")
             lay_out.separator()
             lay_out.operator(
                 operator="mesh.convert_w_mesh", icon='RECOVER_AUTO')
@@ -140,13 +354,18 @@ def register():
     registerWCapsule()
     registerWTorus()
 
+    bpy.utils.register_class(WPreferences)
     bpy.utils.register_class(WAddPanel)
     bpy.utils.register_class(WAddMenu)
     bpy.utils.register_class(ConvertWMesh)
+    bpy.utils.register_class(GenerateWMesh)
     bpy.utils.register_class(WEditPanel)
 
     bpy.types.INFO_MT_mesh_add.prepend(draw_addMenu)
 
+    bpy.app.handlers.save_pre.append(flushUpdatesHandler)
+    bpy.app.handlers.render_pre.append(flushUpdatesHandler)
+
     WTypes = [
         ('NONE', "None", ""),
         ('WPLANE', "WPlane", ""),
@@ -169,6 +388,10 @@ def register():
 
 
 def unregister():
+    flushUpdates()
+    stopAsyncUpdates()
+    stopTimers()
+
     unregisterWPlane()
     unregisterWBox()
     unregisterWScrew()
@@ -179,13 +402,18 @@ def unregister():
     unregisterWCapsule()
     unregisterWTorus()
 
+    bpy.utils.unregister_class(WPreferences)
     bpy.utils.unregister_class(WAddPanel)
     bpy.utils.unregister_class(WAddMenu)
     bpy.utils.unregister_class(ConvertWMesh)
+    bpy.utils.unregister_class(GenerateWMesh)
     bpy.utils.unregister_class(WEditPanel)
 
     bpy.types.INFO_MT_mesh_add.remove(draw_addMenu)
 
+    bpy.app.handlers.save_pre.remove(flushUpdatesHandler)
+    bpy.app.handlers.render_pre.remove(flushUpdatesHandler)
+
     del bpy.types.Mesh.WType
 
 
@@ -0,0 +1,169 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________18.10.2026______/
+# __Last_modified:__18.10.2026______/
+# __Version:________0.1_____________/
+# __________________________________/
+
+"""
+Benchmark of the generators of wmesh_core, runs outside Blender:
+
+    python benchmarks/bench_generators.py [--quick] [--output FILE]
+
+Every generator is run over a sweep of segment counts. Wall time, peak
+memory (tracemalloc) and vertices per second are reported as JSON.
+The geometry, unit sphere and trig table caches are bypassed or emptied
+before every run, so the numbers are of generation from scratch
+(--warm-caches keeps the unit spheres and trig tables between runs).
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loadCore():
+    sys.path.insert(0, ADDON_DIR)
+    return importlib.import_module("wmesh_core")
+
+
+def generatorCases(quick):
+    """(module, generator, sweep parameter, values, fixed arguments)"""
+    small = (8, 32, 128)
+    large = small + (512,)
+    sweep = small if quick else large
+    divisions = (1, 2, 3) if quick else (1, 2, 3, 4, 5, 6)
+    return [
+        ("plane", "WPlane_mesh", "seg_x", sweep,
+            lambda n: {"seg_x": n, "seg_y": n}),
+        ("box", "primitive_Box", "seg_x", sweep,
+            lambda n: {"seg_x": n, "seg_y": n, "seg_z": n}),
+        ("ring", "primitive_Ring", "seg_perimeter", sweep,
+            lambda n: {"seg_perimeter": n, "seg_radius": n // 4 + 1,
+                       "radius_in": 0.5}),
+        ("tube", "primitive_Tube", "seg_perimeter", sweep,
+            lambda n: {"seg_perimeter": n, "seg_height": n,
+                       "seg_radius": n // 4 + 1, "radius_in": 0.5}),
+        ("cone", "primitive_Cone_ME", "seg_perimeter", sweep,
+            lambda n: {"seg_perimeter": n, "seg_height": n,
+                       "seg_radius": n // 4 + 1, "radius_top": 0.5}),
+        ("capsule", "primitive_Capsule_ME", "seg_perimeter", sweep,
+            lambda n: {"seg_perimeter": n, "seg_height": n,
+                       "seg_caps": n // 2 + 1}),
+        ("torus", "primitive_Torus_ME", "seg_main", sweep,
+            lambda n: {"seg_main": n, "seg_minor": n}),
+        ("sphere", "primitive_UVSphere", "segments", sweep,
+            lambda n: {"segments": n, "rings": n // 2 + 2}),
+        ("sphere", "primitive_polySphere", "divisions", divisions,
+            lambda n: {"base": "ICOSA", "divisions": n}),
+        ("sphere", "primitive_geoSphere", "frequency", sweep,
+            lambda n: {"base": "ICOSA", "frequency": n}),
+        ("screw", "primitive_Screw", "rounds", sweep,
+            lambda n: {"rounds": n, "segments": n}),
+    ]
+
+
+def clearCaches():
+    """Empty the caches of wmesh_core shared between the generators."""
+    core = importlib.import_module("wmesh_core")
+    core.geometry.clearTrigTableCache()
+    core.sphere.clearUnitSphereCache()
+
+
+def measure(generator, kwargs, repeat, warm = False):
+    times = []
+    for _ in range(repeat):
+        if not warm:
+            clearCaches()
+        start = time.perf_counter()
+        geo = generator(**kwargs)
+        times.append(time.perf_counter() - start)
+
+    if not warm:
+        clearCaches()
+    tracemalloc.start()
+    geo = generator(**kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "verts": int(geo.vertCount),
+        "faces": int(geo.faceCount),
+        "time_best": best,
+        "time_mean": sum(times) / len(times),
+        "peak_memory": peak,
+        "verts_per_sec": geo.vertCount / best if best > 0 else None,
+    }
+
+
+def runBenchmarks(quick = False, repeat = 3, only = None, warm = False):
+    loadCore()
+
+    results = []
+    for moduleName, name, parameter, values, arguments in generatorCases(
+            quick):
+        if only and name not in only:
+            continue
+        module = importlib.import_module("wmesh_core." + moduleName)
+        # bypass the geometry cache, every run has to generate
+        generator = getattr(module, name)
+        generator = getattr(generator, "__wrapped__", generator)
+        for value in values:
+            kwargs = arguments(value)
+            result = measure(generator, kwargs, repeat, warm)
+            result.update({
+                "generator": name,
+                "parameter": parameter,
+                "value": value,
+                "arguments": kwargs,
+            })
+            results.append(result)
+            sys.stderr.write("%-22s %-14s %6s %10d verts %9.2f ms\n" % (
+                name, parameter, value, result["verts"],
+                result["time_best"] * 1000))
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "repeat": repeat,
+        "warm_caches": warm,
+        "results": results,
+    }
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = __doc__.strip())
+    parser.add_argument(
+        "--quick", action = "store_true", help = "smaller sweeps")
+    parser.add_argument(
+        "--repeat", type = int, default = 3, help = "runs per case")
+    parser.add_argument(
+        "--only", nargs = "*", help = "names of the generators to run")
+    parser.add_argument(
+        "--warm-caches", action = "store_true",
+        help = "keep the unit sphere and trig table caches between runs")
+    parser.add_argument(
+        "--output", help = "JSON file (default: standard output)")
+    args = parser.parse_args(argv)
+
+    report = runBenchmarks(
+        args.quick, max(args.repeat, 1), args.only, args.warm_caches)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,169 +6,526 @@
 # __________________________________/
 
 import bpy
-from mathutils import Vector, Quaternion
-from math import pi
-from typing import List
-
-
-def create_mesh_object(context, verts, edges, faces, name):
+import bmesh
+from bpy.app.handlers import persistent
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import numpy as np
+from collections import OrderedDict
+
+
+# (generator, topology key) -> WTopology, bounded by topologyCacheBytes
+# (the loop buffers are shared with the geometry they came from, which may
+# be gone from the geometry cache)
+topologyCache = OrderedDict()
+topologyCacheBytes = 256 * 1024 * 1024
+topologyCacheUsed = 0
+
+# callback -> time to call it, the timers of Blender without bpy.app.timers
+handlerTimers = OrderedDict()
+
+# (mesh name, WData path) -> update functions waiting for the timer
+pendingUpdates = OrderedDict()
+# (mesh name, WData path) -> time of the last regeneration
+lastUpdates = {}
+# (mesh name, WData path) -> update functions collected by batchUpdates
+batchedUpdates = {}
+# partial update (positions only) -> the full update of the same WMesh
+# type, which covers it when both are waiting
+fullUpdates = {}
+
+# (mesh name, WData path) -> time of the last change of the parameters
+lastRequests = {}
+# WMeshes changed again before the preview delay passed (dragged sliders)
+draggedKeys = set()
+# (mesh name, WData path) -> updates to run at full resolution once the
+# parameters stop changing
+settlingUpdates = OrderedDict()
+
+# (mesh name, WData path) -> the latest job generating in a worker thread
+asyncJobs = {}
+asyncExecutor = None
+
+# larger WMeshes are generated only after a confirmation in the panel
+vertexLimit = 50000000
+
+
+def create_mesh_object(context, geo, name, smooth = False):
 
     # Create new mesh
     mesh = bpy.data.meshes.new(name)
-    mesh.from_pydata(verts, edges, faces)
-    mesh.update()
+    writeMesh(mesh, geo, smooth)
 
     from bpy_extras import object_utils
     return object_utils.object_data_add(context, mesh, operator=None)
 
 
-def circleVerts(radius: float, seg: int, IDs_Offset: int):
-    verts = []
-    vertIDs = []
-
-    if radius <= 0:
-        return [Vector((0, 0, 0))], [IDs_Offset]
+def clearMesh(mesh):
+    if hasattr(mesh, "clear_geometry"):
+        mesh.clear_geometry()
+    else:
+        bm = bmesh.new()
+        bm.to_mesh(mesh)
+        bm.free()
 
-    if seg < 3:
-        seg = 3
 
-    stepAngle = (2 * pi) / seg
+def writeMesh(mesh, geo, smooth = False, topology = None):
+    """
+    Replace the geometry of the mesh with the WGeometry, filling the
+    vertices, loops and polygons straight from its flat buffers. A cached
+    WTopology can be given for a geometry built without faces.
+    """
+    if topology is None:
+        topology = geo.getTopology()
+    coords = geo.coords
 
-    for i in range(seg):
-        vertIDs.append(i + IDs_Offset)
-        quat = Quaternion((0, 0, 1), i * stepAngle)
-        verts.append(quat * Vector((radius, 0.0, 0.0)))
+    clearMesh(mesh)
 
-    return verts, vertIDs
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set("co", coords.ravel())
 
+    mesh.edges.add(len(topology.edges))
+    mesh.edges.foreach_set("vertices", topology.edges.ravel())
 
-def moveVerts(
-            verts: List[Vector],
-            offset: Vector):
+    mesh.loops.add(len(topology.loopVerts))
+    mesh.loops.foreach_set("vertex_index", topology.loopVerts)
 
-    for i in range(len(verts)):
-        verts[i] += offset
+    mesh.polygons.add(len(topology.loopTotals))
+    mesh.polygons.foreach_set("loop_start", topology.loopStarts)
+    mesh.polygons.foreach_set("loop_total", topology.loopTotals)
+    mesh.polygons.foreach_set(
+        "use_smooth",
+        np.full(len(topology.loopTotals), smooth, dtype=bool))
 
+    mesh.update(calc_edges = True)
 
-def rotateVerts(
-            verts: List[Vector],
-            axis: Quaternion):
-
-    for i, vel in enumerate(verts):
-        verts[i] = axis * vel
 
+def writePositions(mesh, coords):
+    """Move the vertices of the mesh without touching anything else."""
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
 
-def bridgeLoops(loop1, loop2, close):
-    faces = []
 
-    if len(loop1) != len(loop2):
+def writeSmooth(mesh, smooth):
+    mesh.polygons.foreach_set(
+        "use_smooth", np.full(len(mesh.polygons), smooth, dtype=bool))
+
+
+def rememberTopology(WData, topologyKey, smooth = False):
+    """
+    Store the topology key and shading of the geometry in the mesh, so the
+    following edits can update it in place (also after reloading the file).
+    """
+    WData["topology"] = repr(topologyKey(WData["animArgs"].to_dict()))
+    WData["smooth"] = smooth
+
+
+def cachedTopology(generator, key):
+    topology = topologyCache.get((generator, key))
+    if topology is not None:
+        topologyCache.move_to_end((generator, key))
+    return topology
+
+
+def topologyBytes(topology):
+    return sum(array.nbytes for array in topology[1:])
+
+
+def cacheTopology(generator, key, topology):
+    """Add the topology to topologyCache, dropping the least recent ones."""
+    global topologyCacheUsed
+    size = topologyBytes(topology)
+    old = topologyCache.pop((generator, key), None)
+    if old is not None:
+        topologyCacheUsed -= topologyBytes(old)
+    if size > topologyCacheBytes:
+        return
+
+    topologyCache[(generator, key)] = topology
+    topologyCacheUsed += size
+    while topologyCacheUsed > topologyCacheBytes:
+        _, old = topologyCache.popitem(last = False)
+        topologyCacheUsed -= topologyBytes(old)
+
+
+def updateWMesh(
+        WData, generator, topologyKey, smooth = False, preview = None,
+        counts = None):
+    """
+    Regenerate the WMesh from its animArgs. The topology depends only on
+    the segmentation and some flags (`topologyKey` picks them out of the
+    animArgs), so it is cached. When the mesh already has the topology,
+    only the vertex positions are computed and written into it in place,
+    which keeps vertex groups, UV layers and other custom data intact.
+
+    While a slider is dragged, `preview` reduces the segmentation of the
+    animArgs to the preview budget of the WType in the preferences, unless
+    the topology does not change and the mesh can be updated in place.
+
+    A mesh of more than vertexLimit vertices (known from `counts` before
+    anything is generated) is not made until allowed by the panel.
+    """
+    args = WData["animArgs"].to_dict()
+    if preview is not None and updateKey(WData) in draggedKeys:
+        budget = previewBudget(addonPreferences(), WData.id_data.WType)
+        if budget > 0 and WData.get("topology") != repr(topologyKey(args)):
+            args = preview(args, budget)
+
+    if counts is not None:
+        verts = counts(args).verts
+        if verts > max(vertexLimit, WData.get("allowedVerts", 0)):
+            # float, ID properties hold 32 bit integers only
+            WData["blockedVerts"] = float(verts)
+            return
+        if "blockedVerts" in WData:
+            del WData["blockedVerts"]
+
+    key = topologyKey(args)
+    topology = cachedTopology(generator, key)
+    inPlace = WData.get("topology") == repr(key)
+
+    job = (generator, args, key, topology, inPlace, smooth)
+    if asyncUpdatesEnabled():
+        submitAsyncUpdate(WData, job)
+    else:
+        applyWMesh(WData, job, generateWMesh(*job[:5]))
+
+
+def generateWMesh(generator, args, key, topology, inPlace):
+    """The pure part of updateWMesh, it may run in a worker thread."""
+    if inPlace or topology is not None:
+        return generator(topology = False, **args)
+    return generator(**args)
+
+
+def applyWMesh(WData, job, geo):
+    """Write the generated geometry into the WMesh (main thread only)."""
+    generator, args, key, topology, inPlace, smooth = job
+    mesh = WData.id_data
+
+    if inPlace and geo.vertCount == len(mesh.vertices) and (
+            topology is None or
+            len(topology.loopTotals) == len(mesh.polygons)):
+        writePositions(mesh, geo.coords)
+        if WData.get("smooth") != smooth:
+            writeSmooth(mesh, smooth)
+            WData["smooth"] = smooth
+        return
+
+    if topology is None:
+        if not geo.topology:
+            geo = generator(**args)
+        topology = geo.getTopology()
+        cacheTopology(generator, key, topology)
+
+    writeMesh(mesh, geo, smooth, topology)
+    WData["topology"] = repr(key)
+    WData["smooth"] = smooth
+
+
+def addonPreferences():
+    context = bpy.context
+    preferences = getattr(context, "preferences", None)
+    if preferences is None:
+        preferences = context.user_preferences
+    addon = preferences.addons.get(__package__)
+    if addon is None:
         return None
+    return addon.preferences
+
+
+def registerTimer(callback):
+    """
+    Call `callback` on the next UI tick, also when it already waits for a
+    later one, and then again after the seconds it returns, until it
+    returns None. Uses bpy.app.timers where they exist (Blender 2.80+), on
+    Blender 2.79 the scene_update_post handler, which runs on every pass
+    of the event loop, calls the callbacks when due.
+    """
+    if hasattr(bpy.app, "timers"):
+        if bpy.app.timers.is_registered(callback):
+            bpy.app.timers.unregister(callback)
+        bpy.app.timers.register(callback, first_interval = 0.0)
+        return
+
+    handlerTimers[callback] = 0.0
+    handlers = bpy.app.handlers.scene_update_post
+    if runHandlerTimers not in handlers:
+        handlers.append(runHandlerTimers)
+
+
+@persistent
+def runHandlerTimers(*args):
+    now = time.perf_counter()
+    for callback, due in list(handlerTimers.items()):
+        if due > now:
+            continue
+        del handlerTimers[callback]
+        wait = callback()
+        if wait is not None:
+            # the callback may have registered itself again meanwhile
+            due = time.perf_counter() + wait
+            handlerTimers[callback] = min(
+                handlerTimers.get(callback, due), due)
+
+
+def stopTimers():
+    """Unregister the timers of the add-on (when it is disabled)."""
+    handlerTimers.clear()
+    if hasattr(bpy.app, "timers"):
+        for callback in (runPendingUpdates, applyAsyncUpdates):
+            if bpy.app.timers.is_registered(callback):
+                bpy.app.timers.unregister(callback)
+    elif runHandlerTimers in bpy.app.handlers.scene_update_post:
+        bpy.app.handlers.scene_update_post.remove(runHandlerTimers)
+
+
+def updateKey(WData):
+    return WData.id_data.name, WData.path_from_id()
+
+
+def requestUpdate(WData, update):
+    """
+    Called by the setters instead of regenerating right away. The WMesh is
+    only marked dirty and a timer regenerates it once per UI tick with its
+    latest parameters, so the intermediate values of a slider drag are
+    dropped. In background mode or with the deferred updates disabled,
+    the update runs immediately.
+    """
+    key = updateKey(WData)
+    if key in batchedUpdates:
+        if update not in batchedUpdates[key]:
+            batchedUpdates[key].append(update)
+        return
+
+    preferences = addonPreferences()
+    if bpy.app.background or (
+            preferences is not None and not preferences.deferred_updates):
+        update(WData)
+        return
+
+    # a change following the previous one quickly is a dragged slider
+    now = time.perf_counter()
+    if now - lastRequests.get(key, -1e9) < previewDelay(preferences):
+        draggedKeys.add(key)
+    lastRequests[key] = now
+
+    updates = pendingUpdates.setdefault(key, [])
+    if update not in updates:
+        updates.append(update)
+
+    registerTimer(runPendingUpdates)
+
+
+def previewDelay(preferences):
+    if preferences is None:
+        return 0.25
+    return preferences.preview_delay
+
+
+def previewBudget(preferences, WType):
+    """Vertex budget of the previews of the WType ('WBOX'...)."""
+    if preferences is None:
+        return 20000
+    return getattr(preferences, "preview_" + WType.lower())
+
+
+def mergeUpdates(updates):
+    """Drop the partial updates whose full update is among the updates."""
+    return [
+        update for update in updates
+        if fullUpdates.get(update) not in updates]
+
+
+def runUpdates(key):
+    updates = pendingUpdates.pop(key)
+    mesh = bpy.data.meshes.get(key[0])
+    if mesh is not None:
+        WData = mesh.path_resolve(key[1])
+        for update in mergeUpdates(updates):
+            update(WData)
+    lastUpdates[key] = time.perf_counter()
+
+    if key in draggedKeys:
+        settling = settlingUpdates.setdefault(key, [])
+        settling.extend(u for u in updates if u not in settling)
+
+
+def runSettledUpdates(key):
+    """The full resolution pass after a preview."""
+    draggedKeys.discard(key)
+    updates = settlingUpdates.pop(key)
+    for update in pendingUpdates.pop(key, ()):
+        if update not in updates:
+            updates.append(update)
+    pendingUpdates[key] = updates
+    runUpdates(key)
+
+
+def runPendingUpdates():
+    """
+    Timer callback. Regenerates the dirty WMeshes which were not updated
+    during the last `update_interval` seconds, and at full resolution the
+    previewed WMeshes which did not change during the preview delay.
+    Returns the time to wait for the others (None unregisters the timer).
+    """
+    preferences = addonPreferences()
+    interval = 0.0
+    if preferences is not None:
+        interval = preferences.update_interval
+    delay = previewDelay(preferences)
+
+    wait = None
+    now = time.perf_counter()
+    for key in list(pendingUpdates):
+        remaining = lastUpdates.get(key, now - interval) + interval - now
+        if remaining > 0:
+            wait = remaining if wait is None else min(wait, remaining)
+        else:
+            runUpdates(key)
 
-    for i in range(len(loop1) - 1):
-        face = (loop1[i], loop1[i + 1], loop2[i + 1], loop2[i])
-        faces.append(face)
-
-    if close:
-        faces.append((loop1[- 1], loop1[0], loop2[0], loop2[- 1]))
-
-    return faces
-
-
-def fanClose(loop, point, closed = True, flipped = False):
-    faces = []
-    prevID = None
-    for idx in loop:
-        if prevID is None and closed:
-            if flipped:
-                faces.append((loop[-1], point, idx))
-            else:
-                faces.append((loop[-1], idx, point))
-        elif prevID is not None:
-            if flipped:
-                faces.append((prevID, point, idx))
-            else:
-                faces.append((prevID, idx, point))
-        prevID = idx
-
-    return faces
-
-
-# subsurf
-def findEdges(faces):
-    edges = []  # edge(vertsIDs)
-    borders = []  # border(edgesIDs)
-
-    for face in faces:
-        polys = len(face)
-        border = []
-        for i in range(polys):
-            if i == polys - 1:
-                edgeA, edgeB = face[i], face[0]
-            else:
-                edgeA, edgeB = face[i], face[i + 1]
-            # sort indexes
-            if edgeA > edgeB:
-                edgeA, edgeB = edgeB, edgeA
-            newEdge = (edgeA, edgeB)
-            # is it a really NEW edge?
-            if newEdge not in edges:
-                border.append(len(edges))
-                edges.append(newEdge)
-            else:
-                border.append(edges.index(newEdge))
-
-        borders.append(border)
-
-    return edges, borders
-
-
-def VectorMedian(IDs, verts):
-    outVec = Vector((0, 0, 0))
-    for IDX in IDs:
-        outVec += verts[IDX]
-    outVec /= len(IDs)
-    return outVec
-
-
-def subdivide(verts, edges, faces, tris):
-    Sedges, borders = findEdges(faces)
-    NewFaces = []
-    vertIDsOffset = len(verts)
-    # midpoints
-    midVerts = []
-    for line in Sedges:
-        midVerts.append((verts[line[0]] + verts[line[1]]) / 2)
-
-    verts.extend(midVerts)
-
-    i = 0
-    for border in borders:
-        face = faces[i]
-        i += 1
-
-        if not tris:
-            centerVec = VectorMedian(face, verts)
-            centerVecID = len(verts)
-            verts.append(centerVec)
-
-            for b in range(len(border)):
-                NewFaces.append((
-                    face[b],
-                    border[b] + vertIDsOffset,
-                    centerVecID,
-                    border[b-1] + vertIDsOffset
-                ))
+    for key in list(settlingUpdates):
+        remaining = lastRequests[key] + delay - now
+        if remaining > 0:
+            wait = remaining if wait is None else min(wait, remaining)
         else:
-            for b in range(len(border)):
-                NewFaces.append((
-                    face[b],
-                    border[b] + vertIDsOffset,
-                    border[b-1] + vertIDsOffset
-                ))
-            NewFaces.append((
-                border[0] + vertIDsOffset,
-                border[1] + vertIDsOffset,
-                border[2] + vertIDsOffset
-            ))
-
-    return verts, edges, NewFaces
+            runSettledUpdates(key)
+
+    return wait
+
+
+def flushUpdates():
+    """Regenerate all the dirty WMeshes now (end of a drag, saving...)."""
+    draggedKeys.clear()
+    for key in list(settlingUpdates):
+        runSettledUpdates(key)
+    for key in list(pendingUpdates):
+        runUpdates(key)
+    waitAsyncUpdates()
+
+
+def asyncUpdatesEnabled():
+    if bpy.app.background:
+        return False
+    preferences = addonPreferences()
+    return preferences is not None and preferences.async_updates
+
+
+def submitAsyncUpdate(WData, job):
+    """
+    Generate the geometry in a worker thread, the timer applies it. A job
+    superseded by a newer one of the same WMesh is cancelled if it did not
+    start yet, otherwise its result is dropped.
+    """
+    global asyncExecutor
+    if asyncExecutor is None:
+        asyncExecutor = ThreadPoolExecutor(max_workers = 1)
+
+    key = updateKey(WData)
+    old = asyncJobs.get(key)
+    if old is not None:
+        old[1].cancel()
+    asyncJobs[key] = (job, asyncExecutor.submit(generateWMesh, *job[:5]))
+
+    registerTimer(applyAsyncUpdates)
+
+
+def applyAsyncUpdate(key, job, future):
+    try:
+        geo = future.result()
+    except Exception:
+        traceback.print_exc()
+        return
+    mesh = bpy.data.meshes.get(key[0])
+    if mesh is not None:
+        applyWMesh(mesh.path_resolve(key[1]), job, geo)
+
+
+def applyAsyncUpdates():
+    """Timer callback, applies the finished jobs on the main thread."""
+    for key, (job, future) in list(asyncJobs.items()):
+        if future.done():
+            del asyncJobs[key]
+            applyAsyncUpdate(key, job, future)
+
+    if asyncJobs:
+        return 0.02
+    return None
+
+
+def asyncUpdatePending(WData):
+    return updateKey(WData) in asyncJobs
+
+
+def waitAsyncUpdates():
+    """Apply the jobs in flight right now (saving, rendering...)."""
+    while asyncJobs:
+        key, (job, future) = asyncJobs.popitem()
+        applyAsyncUpdate(key, job, future)
+
+
+def stopAsyncUpdates():
+    global asyncExecutor
+    for job, future in asyncJobs.values():
+        future.cancel()
+    asyncJobs.clear()
+    if asyncExecutor is not None:
+        asyncExecutor.shutdown(wait = False)
+        asyncExecutor = None
+
+
+@contextmanager
+def batchUpdates(WData):
+    """
+    The setters called inside the block only collect their update
+    functions, the WMesh is regenerated once when the block ends.
+    """
+    key = updateKey(WData)
+    if key in batchedUpdates:
+        yield WData
+        return
+
+    batchedUpdates[key] = []
+    try:
+        yield WData
+    finally:
+        updates = batchedUpdates.pop(key)
+        for update in pendingUpdates.pop(key, ()):
+            if update not in updates:
+                updates.append(update)
+        for update in mergeUpdates(updates):
+            update(WData)
+        lastUpdates[key] = time.perf_counter()
+
+
+class WParams:
+    """Batch editing of the W*Data property groups."""
+
+    def batch(self):
+        """
+        with obj.data.WTorus.batch() as WData:
+            WData.seg_main = 48
+            WData.seg_minor = 24
+        """
+        return batchUpdates(self)
+
+    def set_params(self, **kwargs):
+        """
+        obj.data.WTorus.set_params(seg_main = 48, seg_minor = 24)
+
+        Some setters change other parameters too (radius_main clamps
+        radius_minor...), so the parameters are set in the order they are
+        declared in the property group, not in the order of the keywords,
+        which Python 3.5 does not keep.
+        """
+        properties = self.bl_rna.properties
+        for name in kwargs:
+            if name not in properties:
+                raise AttributeError(
+                    "%s has no parameter '%s'" % (type(self).__name__, name))
+        with batchUpdates(self):
+            for name in properties.keys():
+                if name in kwargs:
+                    setattr(self, name, kwargs[name])
@@ -0,0 +1,42 @@
+import os
+import sys
+import types
+
+import pytest
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# wmesh_core is imported from the add-on directory, without Blender
+sys.path.insert(0, ADDON_DIR)
+
+
+class AddonDirectory:
+    """
+    The add-on directory is a package importing bpy, pytest would import
+    it before running the tests below it. Collect it as a plain directory.
+    """
+
+    def pytest_collect_directory(self, path, parent):
+        if str(path) == ADDON_DIR:
+            return pytest.Dir.from_parent(parent, path = path)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(AddonDirectory(), "wmesh-addon-directory")
+
+
+@pytest.fixture
+def gen_func(monkeypatch):
+    """gen_func imported against a Blender 2.79 without bpy.app.timers."""
+    # fakebpy imports this module, so not at the top
+    from fakebpy import installBpy, importGenFunc
+
+    installBpy(monkeypatch)
+    module = importGenFunc()
+    preferences = types.SimpleNamespace(
+        deferred_updates = True, async_updates = True, update_interval = 0.0,
+        preview_delay = 0.25, preview_wbox = 0)
+    module.addonPreferences = lambda: preferences
+    yield module
+    module.stopAsyncUpdates()
+    module.stopTimers()
@@ -0,0 +1,112 @@
+"""
+The few objects of Blender gen_func touches, with the scene_update_post
+handler of Blender 2.79 as its timer.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import types
+
+from wmesh_core.box import primitive_Box
+
+from conftest import ADDON_DIR
+
+
+class FakeCollection:
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count):
+        self.count += count
+
+    def foreach_set(self, name, values):
+        self.mesh.writes.append((threading.get_ident(), name, len(values)))
+
+
+class FakeMesh:
+    def __init__(self, name, WType):
+        self.name = name
+        self.WType = WType
+        self.writes = []
+        self.clear_geometry()
+
+    def clear_geometry(self):
+        self.vertices = FakeCollection(self)
+        self.edges = FakeCollection(self)
+        self.loops = FakeCollection(self)
+        self.polygons = FakeCollection(self)
+
+    def update(self, calc_edges = False):
+        pass
+
+    def path_resolve(self, path):
+        return self.WData
+
+
+class FakeArgs(dict):
+    def to_dict(self):
+        return dict(self)
+
+
+class FakeWData(dict):
+    def __init__(self, mesh, animArgs):
+        super().__init__(animArgs = FakeArgs(animArgs))
+        self.id_data = mesh
+        mesh.WData = self
+
+    def path_from_id(self):
+        return "WBox"
+
+
+def installBpy(monkeypatch):
+    """Put a Blender 2.79 without bpy.app.timers into sys.modules."""
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda function: function
+    handlers.scene_update_post = []
+    app = types.ModuleType("bpy.app")
+    app.handlers = handlers
+    app.background = False
+    bpy = types.ModuleType("bpy")
+    bpy.app = app
+    bpy.data = types.SimpleNamespace(meshes = {})
+    for name, module in (
+            ("bpy", bpy), ("bpy.app", app), ("bpy.app.handlers", handlers),
+            ("bmesh", types.ModuleType("bmesh"))):
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+def importGenFunc():
+    spec = importlib.util.spec_from_file_location(
+        "gen_func", os.path.join(ADDON_DIR, "gen_func.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def makeBox(**args):
+    mesh = FakeMesh("Box", 'WBOX')
+    sys.modules["bpy"].data.meshes[mesh.name] = mesh
+    return FakeWData(mesh, dict({"seg_x": 1, "seg_y": 1, "seg_z": 1}, **args))
+
+
+def tick():
+    """One pass of the event loop."""
+    for handler in list(sys.modules["bpy.app.handlers"].scene_update_post):
+        handler(None)
+
+
+class RecordingGenerator:
+    """primitive_Box, remembering the arguments of every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, **args):
+        self.calls.append(args)
+        return primitive_Box.__wrapped__(**args)
@@ -0,0 +1,390 @@
+"""
+The loop versions of the generators replaced by array code, kept as plain
+Python references. They return lists of vertex tuples and face tuples.
+"""
+
+from math import pi, sin, cos
+
+
+def bridgeLoops(loop1, loop2, close):
+    if len(loop1) != len(loop2):
+        return []
+    count = len(loop1) if close else len(loop1) - 1
+    faces = []
+    for i in range(count):
+        j = (i + 1) % len(loop1)
+        faces.append((loop1[i], loop1[j], loop2[j], loop2[i]))
+    return faces
+
+
+def circle(radius, angles, height):
+    return [(radius * cos(a), radius * sin(a), height) for a in angles]
+
+
+def circleAngles(seg, sector_from = 0.0, sector_to = 2 * pi):
+    """One more vertex closes the last segment of an open sector."""
+    number = seg if sector_to - sector_from >= 2 * pi else seg + 1
+    step = (sector_to - sector_from) / seg
+    return [i * step + sector_from for i in range(number)]
+
+
+def fanClose(loop, point, closed = True, flipped = False):
+    if closed:
+        pairs = zip(loop[-1:] + loop[:-1], loop)
+    else:
+        pairs = zip(loop[:-1], loop[1:])
+    if flipped:
+        return [(prev, point, next_) for prev, next_ in pairs]
+    return [(prev, next_, point) for prev, next_ in pairs]
+
+
+# torus_______________________________________________________________________
+def legacyTorus(
+        radius_main = 2.0,
+        radius_minor = 0.5,
+        seg_main = 24,
+        seg_minor = 12,
+        sec_from = 0.0,
+        sec_to = 2 * pi):
+    seg_main = max(seg_main, 3)
+    seg_minor = max(seg_minor, 3)
+    if sec_from > sec_to:
+        sec_from, sec_to = sec_to, sec_from
+    closed = sec_to - sec_from >= 2 * pi
+
+    # a zero minor radius collapses every loop into one vertex
+    loopVerts = seg_minor if radius_minor > 0 else 1
+    verts = []
+    loops = []
+
+    def addLoop(angle):
+        loop = []
+        for k in range(loopVerts):
+            minor = k * 2 * pi / seg_minor
+            distance = radius_main + radius_minor * cos(minor)
+            loop.append(len(verts))
+            verts.append((
+                distance * cos(angle), distance * sin(angle),
+                -radius_minor * sin(minor)))
+        loops.append(loop)
+
+    seg_angle = (sec_to - sec_from) / seg_main
+    for i in range(seg_main):
+        addLoop(i * seg_angle + sec_from)
+
+    faces = []
+    if not closed:
+        addLoop(sec_to)
+        centerTo, centerFrom = len(verts), len(verts) + 1
+        verts.append((radius_main * cos(sec_to), radius_main * sin(sec_to), 0))
+        verts.append((
+            radius_main * cos(sec_from), radius_main * sin(sec_from), 0))
+        first, last = loops[0], loops[-1]
+        faces.extend(
+            (first[k - 1], centerFrom, first[k]) for k in range(loopVerts))
+        faces.extend(
+            (last[k - 1], last[k], centerTo) for k in range(loopVerts))
+    else:
+        faces.extend(bridgeLoops(loops[-1], loops[0], True))
+
+    for i in range(1, len(loops)):
+        faces.extend(bridgeLoops(loops[i - 1], loops[i], True))
+
+    return verts, faces
+
+
+# screw_______________________________________________________________________
+def getHeight(j, i, layers, height, addition, segments, layerHeight):
+    if j == 0:
+        return 0
+    elif j == layers - 1:
+        return height
+    elif j == 1:
+        return (i * addition) / 2
+    elif j == layers - 2:
+        if i == 0:
+            return height - (3 * layerHeight)
+        return height - (((segments - i) * addition) / 2)
+    elif j == 3 or j == 4:
+        if i == 0:
+            return ((j - 2) * layerHeight) + (addition / 2)
+        return ((j - 2) * layerHeight) + (i * addition)
+    elif j == layers - 4 or j == layers - 5:
+        if i == segments - 1:
+            a = (layers - j - 3) * layerHeight
+            return height - a - (addition / 2)
+        return ((j - 2) * layerHeight) + (i * addition)
+    return ((j - 2) * layerHeight) + (i * addition)
+
+
+def getAngle(j, i, angle, layers, segments):
+    if j == 1 and i == 2:
+        return angle * 2.2
+    elif j == layers - 2 and i == segments - 2:
+        return (2 * pi) - (angle * 2.2)
+    elif j == 3 or j == 4:
+        if i == 0:
+            return angle / 2
+        elif i == segments and layers == 8:
+            return (2 * pi) - (angle / 2)
+        return angle * i
+    elif j == layers - 4 or j == layers - 5:
+        if i == segments:
+            return (2 * pi) - (angle / 2)
+        return angle * i
+    return angle * i
+
+
+def getRadius(j, i, layers, segments, radius_1, radius_2):
+    if j == 0 or j == layers - 1 or j % 4 == 1 or j % 4 == 2:
+        return radius_1
+    elif ((j == 3 or j == 4) and i == 0) or (
+            (j == layers - 4 or j == layers - 5) and i == segments):
+        return (radius_1 + radius_2) / 2
+    return radius_2
+
+
+def legacyScrew(
+        rounds = 5,
+        segments = 12,
+        height = 2.0,
+        radius_1 = 0.5,
+        radius_2 = 0.6):
+    rounds = max(rounds, 1)
+    segments = max(segments, 4)
+    radius_1 = max(radius_1, 0)
+
+    verts = []
+    faces = []
+    loops = []
+    closure1 = []
+    closure2 = []
+
+    layers = (rounds + 1) * 4
+    layerHeight = height / (layers - 1)
+    addition = (layerHeight * 4) / segments
+    angle = (2 * pi) / segments
+
+    for j in range(layers):
+        loop = []
+        for i in range(segments + 1):
+            h = getHeight(
+                j, i, layers, height, addition, segments, layerHeight)
+            a = getAngle(j, i, angle, layers, segments)
+            r = getRadius(j, i, layers, segments, radius_1, radius_2)
+
+            # where are vertices missing from loops
+            non1 = (
+                i == segments and not (j == layers - 4 or j == layers - 5))
+            non2 = (j == 1 or j == 2) and i < 2
+            non3 = (j == layers - 2 or j == layers - 3) and i > segments - 2
+
+            if not non1 and not non2 and not non3:
+                loop.append(len(verts))
+                if (j == 0 or (4 < j < layers - 1)) and i == 0:
+                    closure1.append(len(verts))
+                elif i == segments - 1 and j < layers - 5:
+                    closure2.append(len(verts))
+                verts.append((r * cos(a), r * sin(a), h))
+        loops.append(loop)
+
+    for i in range(len(loops) - 1):
+        faces.extend(bridgeLoops(loops[i], loops[i + 1], False))
+    faces.extend(bridgeLoops(closure1, closure2, False))
+
+    faces.append((0, loops[3][0], loops[4][0], loops[5][0]))
+    faces.append((0, 1, loops[3][1], loops[3][0]))
+    faces.append((1, 2, loops[1][0], loops[2][0]))
+    faces.append((1, loops[2][0], loops[3][2], loops[3][1]))
+    faces.append((loops[-6][-1], loops[-2][0], loops[-5][-1], loops[-5][-2]))
+    faces.append((loops[-5][-1], loops[-2][0], loops[-1][0], loops[-4][-1]))
+    faces.append((loops[-4][-2], loops[-4][-1], loops[-1][0], loops[-1][-1]))
+    faces.append((loops[-4][-3], loops[-4][-2], loops[-1][-1], loops[-3][-1]))
+    faces.append((loops[-3][-1], loops[-1][-1], loops[-1][-2], loops[-2][-1]))
+
+    # shorten the loops
+    del loops[0][:2]
+    faces.extend(bridgeLoops(loops[0], loops[1], False))
+    del loops[3][:2]
+    faces.extend(bridgeLoops(loops[2], loops[3], False))
+    del loops[-5][-1:]
+    faces.extend(bridgeLoops(loops[-6], loops[-5], False))
+    del loops[-4][-2:]
+    faces.extend(bridgeLoops(loops[-4], loops[-3], False))
+    del loops[-1][-1:]
+    faces.extend(bridgeLoops(loops[-2], loops[-1], False))
+
+    return verts, faces
+
+
+# plane_______________________________________________________________________
+def legacyPlane(
+        size_x = 2.0,
+        size_y = 2.0,
+        seg_x = 1,
+        seg_y = 1,
+        centered = True):
+    dist_x = size_x / seg_x
+    dist_y = size_y / seg_y
+    shift_x, shift_y = (size_x / 2, size_y / 2) if centered else (0, 0)
+
+    verts = []
+    lines = []
+    for i in range(seg_y + 1):
+        lines.append(list(range(len(verts), len(verts) + seg_x + 1)))
+        verts.extend(
+            (j * dist_x - shift_x, i * dist_y - shift_y, 0.0)
+            for j in range(seg_x + 1))
+
+    faces = []
+    for i in range(len(lines) - 1):
+        faces.extend(bridgeLoops(lines[i], lines[i + 1], False))
+    return verts, faces
+
+
+# UV sphere___________________________________________________________________
+def legacyUVSphere(
+        radius = 1.0,
+        segments = 24,
+        rings = 12):
+    verts = [(0.0, 0.0, radius), (0.0, 0.0, -radius)]
+    loops = []
+
+    UAngles = circleAngles(segments)
+    VAngle = pi / rings
+    for v in range(rings - 1):
+        angle = VAngle * (v + 1)
+        loops.append(list(range(len(verts), len(verts) + segments)))
+        verts.extend(circle(
+            radius * sin(angle), UAngles, -radius * cos(angle)))
+
+    faces = []
+    for i in range(rings - 2):
+        faces.extend(bridgeLoops(loops[i], loops[i + 1], True))
+
+    # the top and the bottom fans
+    ring = loops[-1]
+    faces.extend(
+        (ring[k], ring[(k + 1) % segments], 0) for k in range(segments))
+    ring = loops[0]
+    faces.extend(
+        (ring[(k + 1) % segments], ring[k], 1) for k in range(segments))
+    return verts, faces
+
+
+# tube________________________________________________________________________
+def legacyTube(
+        radius_out = 1.0,
+        radius_in = 0.0,
+        height = 2.0,
+        use_inner = True,
+        seg_perimeter = 24,
+        seg_radius = 1,
+        seg_height = 1,
+        sector_from = 0.0,
+        sector_to = 2 * pi,
+        centered = True):
+    verts = []
+    faces = []
+
+    def addVerts(coords):
+        IDs = list(range(len(verts), len(verts) + len(coords)))
+        verts.extend(coords)
+        return IDs
+
+    if radius_out < radius_in:
+        radius_in, radius_out = radius_out, radius_in
+    if sector_from > sector_to:
+        sector_to, sector_from = sector_from, sector_to
+    if radius_out - radius_in < 0.0001:
+        use_inner = False
+    seg_perimeter = max(seg_perimeter, 3)
+
+    stepRadius = (radius_out - radius_in) / seg_radius
+    stepHeight = height / seg_height
+    middlePoint = radius_in <= 0.0001
+    closed = sector_to - sector_from >= 2 * pi
+    angles = circleAngles(seg_perimeter, sector_from, sector_to)
+    rad_number = seg_radius - 1 if middlePoint else seg_radius
+
+    # wall around
+    loops = [
+        addVerts(circle(radius_out, angles, z * stepHeight))
+        for z in range(seg_height + 1)]
+    for i in range(len(loops) - 1):
+        faces.extend(bridgeLoops(loops[i], loops[i + 1], closed))
+
+    if use_inner:
+        # the caps, without their center
+        bottom_rings = [loops[0]]
+        top_rings = [loops[-1]]
+        for rings, z in ((bottom_rings, 0), (top_rings, height)):
+            for r in range(rad_number):
+                rings.append(addVerts(circle(
+                    radius_out - (r + 1) * stepRadius, angles, z)))
+        for i in range(len(top_rings) - 1):
+            faces.extend(bridgeLoops(top_rings[i], top_rings[i + 1], closed))
+        for i in range(len(bottom_rings) - 1):
+            faces.extend(bridgeLoops(
+                bottom_rings[-(i + 1)], bottom_rings[-(i + 2)], closed))
+
+        # the center
+        if middlePoint:
+            if closed:
+                midpoints = addVerts([(0.0, 0.0, 0.0), (0.0, 0.0, height)])
+            else:
+                midpoints = addVerts([
+                    (0.0, 0.0, z * stepHeight)
+                    for z in range(seg_height + 1)])
+            bottomFan = fanClose(
+                bottom_rings[-1], midpoints[0], closed = False, flipped = True)
+            topFan = fanClose(top_rings[-1], midpoints[-1], closed = False)
+            for bottom, top in zip(bottomFan, topFan):
+                faces.extend((bottom, top))
+            if closed:
+                faces.append(
+                    (bottom_rings[-1][-1], midpoints[0], bottom_rings[-1][0]))
+                faces.append(
+                    (top_rings[-1][-1], top_rings[-1][0], midpoints[-1]))
+        else:
+            inner_loops = [bottom_rings[-1]]
+            for z in range(seg_height - 1):
+                inner_loops.append(addVerts(circle(
+                    radius_in, angles, (z + 1) * stepHeight)))
+            inner_loops.append(top_rings[-1])
+            for i in range(len(inner_loops) - 1):
+                faces.extend(bridgeLoops(
+                    inner_loops[-(i + 1)], inner_loops[-(i + 2)], closed))
+
+        # the walls of an open sector
+        if not closed:
+            if middlePoint:
+                rad_number += 1
+            wall_lines = []
+            for wall, angle in ((0, sector_from), (-1, sector_to)):
+                lines = [[loop[wall] for loop in loops]]
+                for r in range(rad_number - 1):
+                    lineRadius = radius_out - (r + 1) * stepRadius
+                    lines.append(
+                        [bottom_rings[r + 1][wall]] +
+                        addVerts([
+                            (lineRadius * cos(angle), lineRadius * sin(angle),
+                             z * stepHeight)
+                            for z in range(1, seg_height)]) +
+                        [top_rings[r + 1][wall]])
+                if middlePoint:
+                    lines.append(midpoints)
+                else:
+                    lines.append([loop[wall] for loop in inner_loops])
+                wall_lines.append(lines)
+
+            lines1, lines2 = wall_lines
+            for i in range(len(lines1) - 1):
+                faces.extend(bridgeLoops(lines1[i], lines1[i + 1], False))
+            for i in range(len(lines2) - 1):
+                faces.extend(bridgeLoops(
+                    lines2[-(i + 1)], lines2[-(i + 2)], False))
+
+    if centered:
+        verts = [(x, y, z - height / 2) for x, y, z in verts]
+    return verts, faces
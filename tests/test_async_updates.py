@@ -0,0 +1,88 @@
+"""
+The background generation of gen_func: the generator runs in the worker
+thread, the result is written into the mesh on the main thread by the
+timer.
+"""
+
+import threading
+
+from wmesh_core.box import primitive_Box, topologyWBox
+
+from fakebpy import makeBox, tick
+
+
+class BlockingGenerator:
+    """primitive_Box, held in the worker thread until released."""
+
+    def __init__(self):
+        self.threads = []
+        self.release = threading.Event()
+
+    def __call__(self, **args):
+        self.threads.append(threading.get_ident())
+        assert self.release.wait(5)
+        return primitive_Box.__wrapped__(**args)
+
+
+def tickUntilApplied(gen_func, WData):
+    """Run the UI ticks until the job is applied."""
+    for _ in range(500):
+        tick()
+        if not gen_func.asyncUpdatePending(WData):
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("the background job was not applied")
+
+
+def test_generated_off_thread_applied_on_main_thread(gen_func):
+    generator = BlockingGenerator()
+    WData = makeBox(seg_x = 3)
+    mesh = WData.id_data
+
+    gen_func.updateWMesh(WData, generator, topologyWBox)
+    assert gen_func.asyncUpdatePending(WData)
+    assert mesh.writes == []
+
+    generator.release.set()
+    tickUntilApplied(gen_func, WData)
+
+    main = threading.get_ident()
+    assert generator.threads and main not in generator.threads
+    assert mesh.writes
+    assert {thread for thread, name, size in mesh.writes} == {main}
+    assert len(mesh.vertices) == primitive_Box(seg_x = 3).vertCount
+    assert WData["topology"] == repr(topologyWBox(WData["animArgs"]))
+
+
+def test_superseded_job_is_dropped(gen_func):
+    generator = BlockingGenerator()
+    WData = makeBox(seg_x = 2)
+    mesh = WData.id_data
+
+    # the first job is running, the second one replaces it
+    gen_func.updateWMesh(WData, generator, topologyWBox)
+    while not generator.threads:
+        threading.Event().wait(0.001)
+    WData["animArgs"]["seg_x"] = 5
+    gen_func.updateWMesh(WData, generator, topologyWBox)
+
+    generator.release.set()
+    tickUntilApplied(gen_func, WData)
+
+    assert len(generator.threads) == 2
+    vertexWrites = [write for write in mesh.writes if write[1] == "co"]
+    assert len(vertexWrites) == 1
+    assert len(mesh.vertices) == primitive_Box(seg_x = 5).vertCount
+
+
+def test_flush_applies_jobs_in_flight(gen_func):
+    generator = BlockingGenerator()
+    WData = makeBox(seg_z = 4)
+    mesh = WData.id_data
+
+    gen_func.updateWMesh(WData, generator, topologyWBox)
+    generator.release.set()
+    gen_func.flushUpdates()
+
+    assert not gen_func.asyncUpdatePending(WData)
+    assert len(mesh.vertices) == primitive_Box(seg_z = 4).vertCount
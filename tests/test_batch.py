@@ -0,0 +1,143 @@
+"""The job spec reader and the batch runner of wmesh_core.batch."""
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from wmesh_core.batch import readJobs, readJobList, runJobs, main
+from wmesh_core.box import primitive_Box
+from wmesh_core.torus import primitive_Torus_ME
+
+jobs = [
+    {"type": "WBOX", "name": "box", "params": {"seg_x": 2, "size_y": 1.5}},
+    {"type": "torus", "params": {
+        "seg_main": 12, "radius_minor": -0.25e-1, "smoothed": True,
+        "sec_to": None}},
+    {"type": "WSPHERE", "name": "s \"\\u00e9[,]\"", "params": {}},
+    [], {}, 12345, -0.5, 1e10, True, False, None, "text ] ,",
+]
+
+
+class CountingReader(io.StringIO):
+    """StringIO remembering how many characters were read."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size = -1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+@pytest.mark.parametrize("chunkSize", [1, 2, 3, 4, 5, 7, 11, 65536])
+@pytest.mark.parametrize("separators", [(",", ":"), (" ,\n ", " : ")])
+def test_list_chunks(chunkSize, separators):
+    text = json.dumps(jobs, separators = separators)
+    spec = io.StringIO(text)
+    assert spec.read(1) == "["
+    assert list(readJobList(spec, chunkSize)) == jobs
+
+
+@pytest.mark.parametrize("text", ["[]", " \n[ ]\n", "\t[\n]"])
+def test_empty_list(text):
+    assert list(readJobs(io.StringIO(text))) == []
+
+
+def test_list_streamed():
+    text = json.dumps([{"name": "job%d" % i} for i in range(20000)])
+    spec = CountingReader(text)
+    first = next(readJobs(spec))
+    assert first == {"name": "job0"}
+    assert spec.consumed < len(text)
+
+
+def test_ndjson():
+    text = "\n  \n".join(json.dumps(job) for job in jobs[:3]) + "\n\n"
+    assert list(readJobs(io.StringIO("\n \n" + text))) == jobs[:3]
+
+
+@pytest.mark.parametrize("text", [
+    "[1,]", "[", "[{\"a\": 1}", "[1, 2", "[1 2]", "[,1]", "[{]", "[tru]",
+    "[1,,2]"])
+@pytest.mark.parametrize("chunkSize", [1, 3, 65536])
+def test_malformed_list(text, chunkSize):
+    spec = io.StringIO(text)
+    assert spec.read(1) == "["
+    with pytest.raises(ValueError):
+        list(readJobList(spec, chunkSize))
+
+
+def test_malformed_ndjson():
+    with pytest.raises(ValueError):
+        list(readJobs(io.StringIO("{\"type\": \"WBOX\"}\n{\"type\"\n")))
+
+
+def readPLY(path):
+    """Vertex coordinates and face tuples of a PLY of writePLY."""
+    with open(path, "rb") as ply:
+        data = ply.read()
+    header, body = data.split(b"end_header\n", 1)
+    counts = {}
+    for line in header.decode("ascii").splitlines():
+        if line.startswith("element"):
+            _, name, count = line.split()
+            counts[name] = int(count)
+
+    coords = np.frombuffer(body, dtype="<f4", count = 3 * counts["vertex"])
+    offset = coords.nbytes
+    faces = []
+    for _ in range(counts["face"]):
+        corners = body[offset]
+        faces.append(tuple(np.frombuffer(
+            body, dtype="<i4", count = corners, offset = offset + 1).tolist()))
+        offset += 1 + 4 * corners
+    assert offset == len(body)
+    return coords.reshape(-1, 3), faces
+
+
+def faceList(geo):
+    return [
+        tuple(face) for block in geo.faceBlocks for face in block.tolist()]
+
+
+def test_runJobs_writes_ply(tmp_path):
+    spec = [
+        {"type": "WBOX", "name": "box", "params": {"seg_x": 2, "seg_z": 3}},
+        {"type": "torus", "params": {"seg_main": 6, "seg_minor": 4}},
+        {"type": "WPYRAMID", "name": "broken"},
+    ]
+    results = list(runJobs(
+        spec, str(tmp_path / "out"), "ply", processes = 1, maxPending = 1))
+
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[1]["name"] == "torus_000001"
+    assert "error" in results[2]
+    assert not (tmp_path / "out" / "broken.ply").exists()
+
+    for result, expected in zip(results, (
+            primitive_Box(seg_x = 2, seg_z = 3),
+            primitive_Torus_ME(seg_main = 6, seg_minor = 4))):
+        assert (result["verts"], result["faces"]) == (
+            expected.vertCount, expected.faceCount)
+        coords, faces = readPLY(result["path"])
+        np.testing.assert_allclose(coords, expected.coords, rtol = 1e-6)
+        assert faces == faceList(expected)
+
+
+def test_main(tmp_path, capsys):
+    specPath = tmp_path / "jobs.json"
+    specPath.write_text(json.dumps([
+        {"type": "WBOX", "name": "a"}, {"type": "WBOX", "name": "b"}]))
+    status = main([
+        str(specPath), "--output-dir", str(tmp_path), "--format", "obj",
+        "--processes", "1"])
+
+    assert status == 0
+    output = capsys.readouterr().out
+    results = [json.loads(line) for line in output.splitlines()]
+    assert [result["name"] for result in results] == ["a", "b"]
+    assert (tmp_path / "a.obj").exists() and (tmp_path / "b.obj").exists()
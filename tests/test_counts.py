@@ -0,0 +1,91 @@
+"""countsW* against the meshes the generators really make."""
+
+import itertools
+from math import pi
+
+import numpy as np
+import pytest
+
+import wmesh_core as core
+
+
+def meshCounts(geo):
+    """WCounts of a WGeometry, the edges as Blender makes them."""
+    pairs = [geo.edges]
+    for block in geo.faceBlocks:
+        pairs.append(np.stack(
+            (block.ravel(), np.roll(block, -1, axis = 1).ravel()), axis = 1))
+    pairs = np.concatenate(pairs)
+    pairs = np.sort(pairs[pairs[:, 0] != pairs[:, 1]], axis = 1)
+    return core.WCounts(
+        geo.vertCount,
+        len(np.unique(pairs, axis = 0)),
+        geo.faceCount,
+        sum(block.size for block in geo.faceBlocks))
+
+
+def grid(**values):
+    names = sorted(values)
+    return [
+        dict(zip(names, combination))
+        for combination in itertools.product(*(values[n] for n in names))]
+
+
+sectors = ((0.0, 2 * pi), (0.5, 2.0), (2.0, 0.5), (-1.0, 7.0))
+
+cases = [
+    (core.WPlane_mesh, core.countsWPlane, grid(
+        seg_x = (1, 2, 5), seg_y = (1, 3), centered = (True, False))),
+    (core.primitive_Box, core.countsWBox, grid(
+        seg_x = (0, 1, 2, 5), seg_y = (1, 3), seg_z = (1, 6))),
+    (core.primitive_Ring, core.countsWRing, [
+        dict(args, sector_from = sector[0], sector_to = sector[1])
+        for args in grid(
+            radius_out = (0.0, 1.0), radius_in = (0.0, 0.00005, 0.3, 2.0),
+            use_inner = (True, False), seg_perimeter = (1, 3, 24),
+            seg_radius = (1, 4))
+        for sector in sectors]),
+    (core.primitive_Tube, core.countsWTube, [
+        dict(args, sector_from = sector[0], sector_to = sector[1])
+        for args in grid(
+            radius_out = (0.0, 1.0), radius_in = (0.0, 0.00005, 0.3, 2.0),
+            use_inner = (True, False), seg_perimeter = (1, 7),
+            seg_radius = (1, 2), seg_height = (1, 5))
+        for sector in sectors]),
+    (core.primitive_Sphere, core.countsWSphere, grid(
+        base = ("UV", "TETRA", "CUBE", "OCTA", "ICOSA", 3),
+        segments = (3, 24), rings = (2, 12), divisions = (0, 1, 3),
+        tris = (True, False), geodesic = (False,)) + grid(
+        base = ("TETRA", "CUBE", "OCTA", "ICOSA"),
+        frequency = (0, 1, 2, 3, 6), geodesic = (True,))),
+    (core.primitive_Cone_ME, core.countsWCone, grid(
+        radius_main = (0.0, 1.0), radius_top = (0.0, 0.5, 2.0),
+        seg_perimeter = (1, 8), seg_height = (0, 1, 3),
+        seg_radius = (0, 1, 4))),
+    (core.primitive_Capsule_ME, core.countsWCapsule, grid(
+        radius = (0.0, 0.5, 3.0), height = (0.0, 1.0, 5.0),
+        seg_perimeter = (1, 8), seg_height = (0, 1, 3),
+        seg_caps = (0, 1, 5))),
+    (core.primitive_Torus_ME, core.countsWTorus, [
+        dict(args, sec_from = sector[0], sec_to = sector[1])
+        for args in grid(
+            radius_minor = (0.0, 0.5), seg_main = (1, 3, 8),
+            seg_minor = (1, 6))
+        for sector in sectors]),
+    (core.primitive_Screw, core.countsWScrew, grid(
+        rounds = (1, 2, 5, 9), segments = (4, 5, 12))),
+]
+
+
+@pytest.mark.parametrize(
+    "generator, counts, args",
+    [
+        pytest.param(
+            generator, counts, args,
+            id = "%s-%d" % (generator.__name__, index))
+        for generator, counts, argsList in cases
+        for index, args in enumerate(argsList)])
+def test_counts(generator, counts, args):
+    # past the geometry cache (primitive_Sphere only dispatches)
+    geo = getattr(generator, "__wrapped__", generator)(**args)
+    assert counts(args) == meshCounts(geo)
@@ -0,0 +1,83 @@
+"""findEdges and subdivide of wmesh_core.geometry."""
+
+import numpy as np
+import pytest
+
+from wmesh_core.bases import baseHedron
+from wmesh_core.geometry import findEdges, subdivide
+
+
+def loopEdges(faces):
+    """Reference of findEdges with a dict, in order of first appearance."""
+    edges = {}
+    borders = []
+    for face in faces:
+        border = []
+        for a, b in zip(face, face[1:] + face[:1]):
+            edge = (min(a, b), max(a, b))
+            border.append(edges.setdefault(edge, len(edges)))
+        borders.append(border)
+    return list(edges), borders
+
+
+def test_findEdges_shared():
+    edges, borders = findEdges(((0, 1, 2, 3), (1, 4, 5, 2)))
+    assert edges.tolist() == [
+        [0, 1], [1, 2], [2, 3], [0, 3], [1, 4], [4, 5], [2, 5]]
+    assert borders.tolist() == [[0, 1, 2, 3], [4, 5, 6, 1]]
+    assert edges.dtype == borders.dtype == np.int32
+
+
+def test_findEdges_empty():
+    edges, borders = findEdges(np.empty((0, 3), dtype=np.int32))
+    assert edges.shape == (0, 2)
+    assert borders.shape == (0, 3)
+
+
+@pytest.mark.parametrize("corners", [3, 4])
+def test_findEdges_random(corners):
+    generator = np.random.default_rng(corners)
+    faces = generator.integers(0, 40, (300, corners)).tolist()
+    edges, borders = findEdges(faces)
+    expectedEdges, expectedBorders = loopEdges(faces)
+    assert [tuple(edge) for edge in edges.tolist()] == expectedEdges
+    assert borders.tolist() == expectedBorders
+
+
+@pytest.mark.parametrize(
+    "base, tris", [("TETRA", True), ("OCTA", True), ("ICOSA", True),
+                   ("CUBE", False)])
+def test_subdivide(base, tris):
+    verts, _, faces = baseHedron(base)
+    verts = np.array(verts, dtype=np.float64)
+    faces = np.array(faces, dtype=np.int32)
+    edges, _ = findEdges(faces)
+
+    newVerts, _, newFaces = subdivide(verts, [], faces, tris)
+
+    # old vertices first, then a midpoint per edge (and a center per quad)
+    np.testing.assert_array_equal(newVerts[:len(verts)], verts)
+    midpoints = newVerts[len(verts):len(verts) + len(edges)]
+    np.testing.assert_allclose(
+        midpoints, (verts[edges[:, 0]] + verts[edges[:, 1]]) / 2)
+    if tris:
+        assert len(newVerts) == len(verts) + len(edges)
+    else:
+        np.testing.assert_allclose(
+            newVerts[len(verts) + len(edges):], verts[faces].mean(axis = 1))
+
+    # every face splits into 4 of the same size, the surface stays closed
+    # and the Euler characteristic stays 2
+    assert newFaces.shape == (4 * len(faces), faces.shape[1])
+    newEdges, _ = findEdges(newFaces)
+    assert len(newVerts) - len(newEdges) + len(newFaces) == 2
+    directed = {
+        (a, b) for face in newFaces.tolist()
+        for a, b in zip(face, face[1:] + face[:1])}
+    assert len(directed) == newFaces.size
+    assert all((b, a) in directed for a, b in directed)
+
+    # the split faces start at the corners of their face, in order
+    for index, face in enumerate(faces.tolist()):
+        for corner, child in zip(face, newFaces[4 * index:].tolist()):
+            assert child[0] == corner
@@ -0,0 +1,102 @@
+"""The array generators against their loop versions (tests/legacy.py)."""
+
+import itertools
+from math import pi
+
+import numpy as np
+import pytest
+
+from wmesh_core.plane import WPlane_mesh
+from wmesh_core.screw import primitive_Screw
+from wmesh_core.sphere import primitive_UVSphere
+from wmesh_core.torus import primitive_Torus_ME
+from wmesh_core.tube import primitive_Tube
+
+from legacy import (
+    legacyPlane, legacyScrew, legacyTorus, legacyTube, legacyUVSphere)
+
+sectors = ((0.0, 2 * pi), (0.5, 2.0), (2.0, 0.5), (-1.0, 7.0), (0.0, pi))
+
+
+def faceList(geo):
+    faces = []
+    for block in geo.faceBlocks:
+        faces.extend(tuple(face) for face in block.tolist())
+    return faces
+
+
+def assertSameMesh(geo, verts, faces):
+    assert geo.vertCount == len(verts)
+    np.testing.assert_allclose(
+        geo.coords, np.array(verts, dtype=np.float64), rtol = 0, atol = 1e-6)
+    assert faceList(geo) == faces
+
+
+@pytest.mark.parametrize(
+    "rounds, segments, radius_1, radius_2",
+    list(itertools.product(
+        (1, 2, 3, 5, 9), (4, 5, 6, 12, 20), (0.5, 0.0), (0.6, 0.25))))
+def test_screw(rounds, segments, radius_1, radius_2):
+    args = {
+        "rounds": rounds, "segments": segments, "height": 1.7,
+        "radius_1": radius_1, "radius_2": radius_2}
+    assertSameMesh(
+        primitive_Screw.__wrapped__(**args), *legacyScrew(**args))
+
+
+@pytest.mark.parametrize(
+    "seg_main, seg_minor, radius_minor, sector",
+    list(itertools.product(
+        (1, 3, 8, 24), (3, 4, 12), (0.5, 0.0), sectors)))
+def test_torus(seg_main, seg_minor, radius_minor, sector):
+    args = {
+        "radius_main": 2.0, "radius_minor": radius_minor,
+        "seg_main": seg_main, "seg_minor": seg_minor,
+        "sec_from": sector[0], "sec_to": sector[1]}
+    assertSameMesh(
+        primitive_Torus_ME.__wrapped__(**args), *legacyTorus(**args))
+
+
+# radius_in of zero and below 0.0001 have a middle point, 0.3 an inner wall,
+# 1.0 a wall only (the thickness is zero)
+@pytest.mark.parametrize(
+    "radius_in, use_inner, seg_perimeter, seg_radius, seg_height, sector",
+    list(itertools.product(
+        (0.0, 0.00005, 0.3, 1.0), (True, False), (1, 5, 24), (1, 3),
+        (1, 4), sectors)))
+def test_tube(
+        radius_in, use_inner, seg_perimeter, seg_radius, seg_height, sector):
+    args = {
+        "radius_out": 1.0, "radius_in": radius_in, "height": 1.5,
+        "use_inner": use_inner, "seg_perimeter": seg_perimeter,
+        "seg_radius": seg_radius, "seg_height": seg_height,
+        "sector_from": sector[0], "sector_to": sector[1]}
+    assertSameMesh(primitive_Tube.__wrapped__(**args), *legacyTube(**args))
+
+
+@pytest.mark.parametrize("centered", [True, False])
+@pytest.mark.parametrize("radius_out", [1.0, 0.2])
+def test_tube_swapped_radii(centered, radius_out):
+    args = {
+        "radius_out": radius_out, "radius_in": 0.6, "seg_radius": 2,
+        "seg_height": 3, "sector_from": 1.0, "sector_to": 4.0,
+        "centered": centered}
+    assertSameMesh(primitive_Tube.__wrapped__(**args), *legacyTube(**args))
+
+
+@pytest.mark.parametrize(
+    "segments, rings", list(itertools.product((3, 4, 24), (2, 3, 12))))
+def test_uv_sphere(segments, rings):
+    args = {"radius": 1.3, "segments": segments, "rings": rings}
+    assertSameMesh(
+        primitive_UVSphere.__wrapped__(**args), *legacyUVSphere(**args))
+
+
+@pytest.mark.parametrize(
+    "seg_x, seg_y, centered",
+    list(itertools.product((1, 2, 7), (1, 5), (True, False))))
+def test_plane(seg_x, seg_y, centered):
+    args = {
+        "size_x": 3.0, "size_y": 1.5, "seg_x": seg_x, "seg_y": seg_y,
+        "centered": centered}
+    assertSameMesh(WPlane_mesh.__wrapped__(**args), *legacyPlane(**args))
@@ -0,0 +1,121 @@
+"""batch() and set_params() of the W*Data property groups."""
+
+import sys
+from collections import OrderedDict
+import types
+
+import pytest
+
+from wmesh_core.box import topologyWBox, countsWBox
+
+from fakebpy import FakeMesh, FakeWData, RecordingGenerator
+
+
+def parameter(gen_func, name, update, adjust = None):
+    """A property whose setter requests `update`, like those of W_*.py."""
+    def get(self):
+        return self["animArgs"][name]
+
+    def set(self, value):
+        self["animArgs"][name] = value
+        if adjust is not None:
+            adjust(self["animArgs"], value)
+        gen_func.requestUpdate(self, update)
+
+    return property(get, set)
+
+
+def makeData(gen_func, parameters, **args):
+    """A W*Data with the parameters (name -> property), in their order."""
+    namespace = dict(parameters)
+    namespace["bl_rna"] = types.SimpleNamespace(
+        properties = OrderedDict.fromkeys(
+            ["rna_type"] + [name for name, _ in parameters]))
+    cls = type("WBoxData", (FakeWData, gen_func.WParams), namespace)
+    mesh = FakeMesh("Box", 'WBOX')
+    sys.modules["bpy"].data.meshes[mesh.name] = mesh
+    return cls(mesh, args)
+
+
+@pytest.fixture
+def box(gen_func):
+    """
+    A WBox whose size_x runs a positions only update, covered by the full
+    update of the segments.
+    """
+    gen_func.addonPreferences().async_updates = False
+    generator = RecordingGenerator()
+
+    def update(WData):
+        gen_func.updateWMesh(
+            WData, generator, topologyWBox, counts = countsWBox)
+
+    def updateSize(WData):
+        gen_func.updateWMesh(WData, generator, topologyWBox)
+
+    gen_func.fullUpdates[updateSize] = update
+    WData = makeData(gen_func, [
+        ("size_x", parameter(gen_func, "size_x", updateSize)),
+        ("seg_x", parameter(gen_func, "seg_x", update)),
+        ("seg_y", parameter(gen_func, "seg_y", update))],
+        size_x = 2.0, seg_x = 1, seg_y = 1, seg_z = 1)
+    return WData, generator
+
+
+def test_set_params_generates_once(gen_func, box):
+    WData, generator = box
+    WData.set_params(size_x = 3.0, seg_x = 4, seg_y = 5)
+    assert len(generator.calls) == 1
+    assert generator.calls[0]["size_x"] == 3.0
+    assert generator.calls[0]["seg_x"] == 4
+    assert generator.calls[0]["seg_y"] == 5
+    assert not gen_func.pendingUpdates
+
+
+def test_batch_generates_once(gen_func, box):
+    WData, generator = box
+    with WData.batch():
+        WData.seg_x = 2
+        WData.size_x = 1.5
+        WData.seg_x = 3
+        with WData.batch():
+            WData.seg_y = 2
+        assert generator.calls == []
+    assert len(generator.calls) == 1
+    assert generator.calls[0]["seg_x"] == 3
+    assert generator.calls[0]["seg_y"] == 2
+
+
+def test_set_params_unknown(gen_func, box):
+    WData, generator = box
+    with pytest.raises(AttributeError):
+        WData.set_params(seg_x = 7, seg_w = 2)
+    assert WData.seg_x == 1
+    assert generator.calls == []
+
+
+def clampMinor(args, value):
+    args["radius_minor"] = min(args["radius_minor"], value)
+
+
+def clampMain(args, value):
+    args["radius_main"] = max(args["radius_main"], value)
+
+
+@pytest.mark.parametrize("names", [
+    ("radius_main", "radius_minor"), ("radius_minor", "radius_main")])
+def test_set_params_declared_order(gen_func, names):
+    # the torus radii clamp each other, the result must not depend on the
+    # order of the keywords
+    def update(WData):
+        pass
+
+    WData = makeData(gen_func, [
+        ("radius_main", parameter(
+            gen_func, "radius_main", update, clampMinor)),
+        ("radius_minor", parameter(
+            gen_func, "radius_minor", update, clampMain))],
+        radius_main = 2.0, radius_minor = 0.5)
+    values = {"radius_main": 0.3, "radius_minor": 0.6}
+    WData.set_params(**OrderedDict((name, values[name]) for name in names))
+    assert (WData.radius_main, WData.radius_minor) == (0.6, 0.6)
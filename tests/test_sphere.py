@@ -0,0 +1,77 @@
+"""The geodesic and subdivided spheres are closed, outward facing spheres."""
+
+import numpy as np
+import pytest
+
+from wmesh_core import countsWSphere
+from wmesh_core.sphere import primitive_geoSphere, primitive_polySphere
+
+# vertices, edges and faces of the bases, corners of their faces
+bases = {
+    "TETRA": (4, 6, 4, 3),
+    "CUBE": (8, 12, 6, 4),
+    "OCTA": (6, 12, 8, 3),
+    "ICOSA": (12, 30, 20, 3),
+}
+
+
+def faceArray(geo):
+    return np.concatenate(geo.faceBlocks)
+
+
+def assertClosedSphere(geo, radius):
+    faces = faceArray(geo)
+    coords = geo.coords.astype(np.float64)
+
+    # every edge is used once in each direction: closed, 2-manifold and
+    # consistently oriented
+    directed = np.stack(
+        (faces.ravel(), np.roll(faces, -1, axis = 1).ravel()), axis = 1)
+    assert len(np.unique(directed, axis = 0)) == len(directed)
+    assert not (directed[:, 0] == directed[:, 1]).any()
+    reversed_ = {tuple(edge) for edge in directed[:, ::-1].tolist()}
+    assert reversed_ == {tuple(edge) for edge in directed.tolist()}
+
+    # all the vertices are used, distinct and on the sphere
+    assert set(faces.ravel().tolist()) == set(range(geo.vertCount))
+    assert len(np.unique(coords.round(5), axis = 0)) == geo.vertCount
+    np.testing.assert_allclose(
+        np.linalg.norm(coords, axis = 1), radius, rtol = 1e-5)
+
+    # the normals (Newell) point away from the center
+    corners = coords[faces]
+    following = np.roll(corners, -1, axis = 1)
+    normals = np.cross(corners, following).sum(axis = 1)
+    assert (np.einsum("ij,ij->i", normals, corners.mean(axis = 1)) > 0).all()
+
+
+@pytest.mark.parametrize("base", sorted(bases))
+@pytest.mark.parametrize("frequency", [1, 2, 3, 4, 7])
+def test_geodesic(base, frequency):
+    radius = 1.5
+    geo = primitive_geoSphere.__wrapped__(
+        base = base, radius = radius, frequency = frequency)
+    assertClosedSphere(geo, radius)
+
+    verts, edges, faces, corners = bases[base]
+    if corners == 3:
+        inner = (frequency - 1) * (frequency - 2) // 2
+    else:
+        inner = (frequency - 1) ** 2
+    assert geo.vertCount == verts + edges * (frequency - 1) + faces * inner
+    assert geo.faceCount == faces * frequency ** 2
+    assert faceArray(geo).shape[1] == corners
+
+    counts = countsWSphere({
+        "base": base, "radius": radius, "geodesic": True,
+        "frequency": frequency})
+    assert (counts.verts, counts.faces) == (geo.vertCount, geo.faceCount)
+
+
+@pytest.mark.parametrize("base", sorted(bases))
+@pytest.mark.parametrize("divisions", [0, 1, 3])
+@pytest.mark.parametrize("tris", [False, True])
+def test_polySphere(base, divisions, tris):
+    geo = primitive_polySphere.__wrapped__(
+        base = base, radius = 0.5, divisions = divisions, tris = tris)
+    assertClosedSphere(geo, 0.5)
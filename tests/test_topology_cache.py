@@ -0,0 +1,44 @@
+"""The topology cache of gen_func, bounded by the bytes of its arrays."""
+
+from wmesh_core.box import primitive_Box, topologyWBox
+
+from fakebpy import makeBox, RecordingGenerator
+
+
+def boxTopologyBytes(gen_func, seg_x):
+    geo = primitive_Box.__wrapped__(seg_x = seg_x, seg_y = 4, seg_z = 4)
+    return gen_func.topologyBytes(geo.getTopology())
+
+
+def test_least_recent_topologies_dropped(gen_func):
+    gen_func.addonPreferences().async_updates = False
+    generator = RecordingGenerator()
+    WData = makeBox(seg_y = 4, seg_z = 4)
+    sizes = {seg_x: boxTopologyBytes(gen_func, seg_x) for seg_x in (8, 9, 10)}
+    gen_func.topologyCacheBytes = sizes[9] + sizes[10]
+
+    for seg_x in (8, 9, 10):
+        WData["animArgs"]["seg_x"] = seg_x
+        gen_func.updateWMesh(WData, generator, topologyWBox)
+
+    keys = [key for _, key in gen_func.topologyCache]
+    assert keys == [topologyWBox({"seg_x": seg_x, "seg_y": 4, "seg_z": 4})
+                    for seg_x in (9, 10)]
+    assert gen_func.topologyCacheUsed == sizes[9] + sizes[10]
+
+    # a hit makes the topology the most recent one
+    WData["animArgs"]["seg_x"] = 9
+    gen_func.updateWMesh(WData, generator, topologyWBox)
+    assert [key for _, key in gen_func.topologyCache][-1] == keys[0]
+
+
+def test_topology_larger_than_the_cache(gen_func):
+    gen_func.addonPreferences().async_updates = False
+    WData = makeBox(seg_x = 8, seg_y = 4, seg_z = 4)
+    gen_func.topologyCacheBytes = boxTopologyBytes(gen_func, 8) - 1
+
+    gen_func.updateWMesh(WData, RecordingGenerator(), topologyWBox)
+    assert not gen_func.topologyCache
+    assert gen_func.topologyCacheUsed == 0
+    assert len(WData.id_data.vertices) == primitive_Box(
+        seg_x = 8, seg_y = 4, seg_z = 4).vertCount
@@ -0,0 +1,127 @@
+"""
+The deferred updates of gen_func: requestUpdate, the previews of dragged
+sliders and the full resolution pass once they settle.
+"""
+
+import types
+
+import pytest
+
+from wmesh_core.box import primitive_Box, topologyWBox, previewWBox, countsWBox
+
+from fakebpy import makeBox, tick, RecordingGenerator
+
+
+@pytest.fixture
+def clock(gen_func, monkeypatch):
+    """The time seen by gen_func, moved by the test."""
+    clock = types.SimpleNamespace(now = 0.0)
+    monkeypatch.setattr(
+        gen_func, "time",
+        types.SimpleNamespace(perf_counter = lambda: clock.now))
+    gen_func.addonPreferences().async_updates = False
+    return clock
+
+
+def boxUpdate(gen_func, generator):
+    def update(WData):
+        gen_func.updateWMesh(
+            WData, generator, topologyWBox,
+            preview = previewWBox, counts = countsWBox)
+    return update
+
+
+def test_drag_previews_every_tick_then_settles(gen_func, clock):
+    gen_func.addonPreferences().preview_wbox = 500
+    generator = RecordingGenerator()
+    update = boxUpdate(gen_func, generator)
+    WData = makeBox(seg_y = 20, seg_z = 20)
+    mesh = WData.id_data
+
+    for index, seg_x in enumerate((10, 20, 30, 40)):
+        clock.now = 0.05 * index
+        WData["animArgs"]["seg_x"] = seg_x
+        gen_func.requestUpdate(WData, update)
+        assert len(generator.calls) == index
+
+        # every change is shown on the next tick, the first one in full,
+        # the following ones as previews within the budget
+        tick()
+        assert len(generator.calls) == index + 1
+        if index == 0:
+            assert generator.calls[-1]["seg_x"] == seg_x
+        else:
+            assert len(mesh.vertices) <= 500
+
+        clock.now += 0.02
+        tick()
+        assert len(generator.calls) == index + 1
+
+    # the full resolution once the slider stops for the preview delay
+    clock.now = 0.15 + 0.2
+    tick()
+    assert len(generator.calls) == 4
+    clock.now = 0.15 + 0.26
+    tick()
+    assert len(generator.calls) == 5
+    assert len(mesh.vertices) == primitive_Box(
+        seg_x = 40, seg_y = 20, seg_z = 20).vertCount
+    assert not gen_func.draggedKeys
+
+    tick()
+    assert len(generator.calls) == 5
+    assert not gen_func.handlerTimers
+
+
+def test_separate_changes_are_not_previewed(gen_func, clock):
+    gen_func.addonPreferences().preview_wbox = 500
+    generator = RecordingGenerator()
+    update = boxUpdate(gen_func, generator)
+    WData = makeBox(seg_y = 20, seg_z = 20)
+
+    for index, seg_x in enumerate((10, 20)):
+        clock.now = index
+        WData["animArgs"]["seg_x"] = seg_x
+        gen_func.requestUpdate(WData, update)
+        tick()
+        assert generator.calls[-1]["seg_x"] == seg_x
+    assert len(generator.calls) == 2
+    assert not gen_func.draggedKeys
+
+
+def test_update_interval(gen_func, clock):
+    gen_func.addonPreferences().update_interval = 0.1
+    generator = RecordingGenerator()
+    update = boxUpdate(gen_func, generator)
+    WData = makeBox()
+
+    gen_func.requestUpdate(WData, update)
+    tick()
+    clock.now = 0.05
+    WData["animArgs"]["seg_x"] = 2
+    gen_func.requestUpdate(WData, update)
+    tick()
+    assert len(generator.calls) == 1
+
+    clock.now = 0.1
+    tick()
+    assert len(generator.calls) == 2
+    assert generator.calls[-1]["seg_x"] == 2
+
+
+def test_preview_budget_of_the_WType(gen_func, clock):
+    # the WBox previews are disabled, the budget of the WPlanes is not its
+    preferences = gen_func.addonPreferences()
+    preferences.preview_wbox = 0
+    preferences.preview_wplane = 100
+    generator = RecordingGenerator()
+    update = boxUpdate(gen_func, generator)
+    WData = makeBox(seg_y = 20, seg_z = 20)
+
+    for index, seg_x in enumerate((10, 20, 30)):
+        clock.now = 0.05 * index
+        WData["animArgs"]["seg_x"] = seg_x
+        gen_func.requestUpdate(WData, update)
+        tick()
+        assert generator.calls[-1]["seg_x"] == seg_x
+    assert gen_func.draggedKeys
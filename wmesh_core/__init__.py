@@ -0,0 +1,53 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________18.10.2026______/
+# __Last_modified:__18.10.2026______/
+# __Version:________0.1_____________/
+# __________________________________/
+
+"""
+Geometry kernels of the WMeshes. The package has no Blender dependency
+(only numpy), so it can generate meshes in any Python process; the W_*
+modules of the add-on write its results into Blender meshes.
+"""
+
+from .geometry import (
+    WGeometry,
+    WTopology,
+    WCounts,
+    geometryCacheInfo,
+    clearGeometryCache
+)
+from .plane import WPlane_mesh, topologyWPlane, countsWPlane
+from .box import primitive_Box, topologyWBox, countsWBox
+from .ring import primitive_Ring, topologyWRing, countsWRing
+from .tube import primitive_Tube, topologyWTube, countsWTube
+from .sphere import (
+    primitive_UVSphere,
+    primitive_polySphere,
+    primitive_geoSphere,
+    primitive_Sphere,
+    topologyWSphere,
+    countsWSphere
+)
+from .cone import primitive_Cone_ME, topologyWCone, countsWCone
+from .capsule import primitive_Capsule_ME, topologyWCapsule, countsWCapsule
+from .torus import primitive_Torus_ME, topologyWTorus, countsWTorus
+from .screw import primitive_Screw, topologyWScrew, countsWScrew
+from .bases import baseHedron
+
+__all__ = [
+    "WGeometry", "WTopology", "WCounts",
+    "geometryCacheInfo", "clearGeometryCache",
+    "WPlane_mesh", "topologyWPlane", "countsWPlane",
+    "primitive_Box", "topologyWBox", "countsWBox",
+    "primitive_Ring", "topologyWRing", "countsWRing",
+    "primitive_Tube", "topologyWTube", "countsWTube",
+    "primitive_UVSphere", "primitive_polySphere", "primitive_geoSphere",
+    "primitive_Sphere", "topologyWSphere", "countsWSphere",
+    "primitive_Cone_ME", "topologyWCone", "countsWCone",
+    "primitive_Capsule_ME", "topologyWCapsule", "countsWCapsule",
+    "primitive_Torus_ME", "topologyWTorus", "countsWTorus",
+    "primitive_Screw", "topologyWScrew", "countsWScrew",
+    "baseHedron"
+]
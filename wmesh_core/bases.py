@@ -5,7 +5,6 @@
 #___Version:________0.2_____________/
 #___________________________________/
 
-from mathutils import Vector
 from math import sqrt
 
 def baseHedron(base):
@@ -16,14 +15,14 @@ def baseHedron(base):
 
     if base == "CUBE":
         verts = [
-            Vector((-1,-1,-1)),
-            Vector((1,-1,-1)),
-            Vector((1,1,-1)),
-            Vector((-1,1,-1)),
-            Vector((-1,-1,1)),
-            Vector((1,-1,1)),
-            Vector((1,1,1)),
-            Vector((-1,1,1))
+            (-1,-1,-1),
+            (1,-1,-1),
+            (1,1,-1),
+            (-1,1,-1),
+            (-1,-1,1),
+            (1,-1,1),
+            (1,1,1),
+            (-1,1,1)
         ]
         faces = [
             (3,2,1,0),
@@ -37,10 +36,10 @@ def baseHedron(base):
     elif base == "TETRA":
         a = 1/sqrt(2)
         verts = [
-            Vector((1,0,-a)),
-            Vector((-1,0,-a)),
-            Vector((0,1,a)),
-            Vector((0,-1,a))
+            (1,0,-a),
+            (-1,0,-a),
+            (0,1,a),
+            (0,-1,a)
         ]
         faces = [
             (0,3,1),
@@ -51,12 +50,12 @@ def baseHedron(base):
 
     elif base == "OCTA":
         verts = [
-            Vector((1,0,0)),
-            Vector((-1,0,0)),
-            Vector((0,1,0)),
-            Vector((0,-1,0)),
-            Vector((0,0,1)),
-            Vector((0,0,-1))
+            (1,0,0),
+            (-1,0,0),
+            (0,1,0),
+            (0,-1,0),
+            (0,0,1),
+            (0,0,-1)
         ]
         faces = [
             (0,3,5),
@@ -72,20 +71,20 @@ def baseHedron(base):
     elif base == "ICOSA":
         a = (1+sqrt(5))/2
         verts = [
-            Vector((0,1,a)),
-            Vector((0,1,-a)),
-            Vector((0,-1,a)),
-            Vector((0,-1,-a)),
+            (0,1,a),
+            (0,1,-a),
+            (0,-1,a),
+            (0,-1,-a),
 
-            Vector((1,a,0)),
-            Vector((1,-a,0)),
-            Vector((-1,a,0)),
-            Vector((-1,-a,0)),
+            (1,a,0),
+            (1,-a,0),
+            (-1,a,0),
+            (-1,-a,0),
 
-            Vector((a,0,1)),
-            Vector((a,0,-1)),
-            Vector((-a,0,1)),
-            Vector((-a,0,-1)),
+            (a,0,1),
+            (a,0,-1),
+            (-a,0,1),
+            (-a,0,-1),
         ]
         faces = [
             (0,8,4),
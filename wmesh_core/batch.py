@@ -0,0 +1,228 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________18.10.2026______/
+# __Last_modified:__18.10.2026______/
+# __Version:________0.1_____________/
+# __________________________________/
+
+"""
+Generates WMeshes in batch, outside Blender:
+
+    python -m wmesh_core jobs.ndjson --output-dir meshes --format ply
+
+The jobs are read from a JSON list or from NDJSON (one job per line),
+"-" reads the standard input. Both are streamed, a job is submitted as
+soon as it is read. A job looks like:
+
+    {"type": "WTORUS", "name": "torus_48", "params": {"seg_main": 48}}
+
+The params are the animArgs of the WMesh. The jobs run in a process pool
+and the workers write the files themselves, only a short summary of every
+job comes back (printed as NDJSON). At most `--max-pending` jobs are
+queued at once, so the memory does not depend on the size of the spec.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import deque
+from multiprocessing import Pool, cpu_count
+
+from . import geometry, sphere
+from .export import writers
+from .plane import WPlane_mesh
+from .box import primitive_Box
+from .ring import primitive_Ring
+from .tube import primitive_Tube
+from .sphere import primitive_Sphere
+from .cone import primitive_Cone_ME
+from .capsule import primitive_Capsule_ME
+from .torus import primitive_Torus_ME
+from .screw import primitive_Screw
+
+whitespace = re.compile(r"[ \t\n\r]*")
+
+generators = {
+    "WPLANE": WPlane_mesh,
+    "WBOX": primitive_Box,
+    "WRING": primitive_Ring,
+    "WTUBE": primitive_Tube,
+    "WSPHERE": primitive_Sphere,
+    "WCONE": primitive_Cone_ME,
+    "WCAPSULE": primitive_Capsule_ME,
+    "WTORUS": primitive_Torus_ME,
+    "WSCREW": primitive_Screw
+}
+
+
+def jobGenerator(WType):
+    """Accepts the WType ('WTORUS') as well as 'torus' or 'WTorus'."""
+    WType = WType.upper()
+    if not WType.startswith("W"):
+        WType = "W" + WType
+    if WType not in generators:
+        raise ValueError("unknown primitive type '%s'" % WType)
+    return generators[WType]
+
+
+def readJobs(spec):
+    """Yield the jobs of a JSON list or of an NDJSON stream."""
+    first = spec.read(1)
+    while first and first.isspace():
+        first = spec.read(1)
+
+    if first == "[":
+        for job in readJobList(spec):
+            yield job
+        return
+
+    line = first + spec.readline()
+    while line:
+        if line.strip():
+            yield json.loads(line)
+        line = spec.readline()
+
+
+def readJobList(spec, chunkSize = 65536):
+    """
+    Yield the items of the JSON list being read from `spec` (past its '[')
+    one by one. The list is decoded chunk by chunk, so only the current
+    job and the unread rest of a chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def readMore():
+        nonlocal buffer, position, eof
+        chunk = spec.read(chunkSize)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    expectJob = True
+    empty = True
+    while True:
+        position = whitespace.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise ValueError("unterminated JSON list of jobs")
+            readMore()
+            continue
+
+        if not expectJob or empty:
+            if buffer[position] == "]":
+                return
+        if not expectJob:
+            if buffer[position] != ",":
+                raise ValueError(
+                    "expected ',' or ']' at character %d of the JSON list"
+                    % position)
+            position += 1
+            expectJob = True
+            continue
+
+        try:
+            job, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            end = None
+        if end is not None and not eof and not isinstance(
+                job, (dict, list, str)):
+            # a number or literal may continue in the next chunk
+            after = whitespace.match(buffer, end).end()
+            if after == len(buffer) or buffer[after] not in ",]":
+                end = None
+        if end is None:
+            readMore()
+            continue
+
+        yield job
+        position = end
+        expectJob = False
+        empty = False
+
+
+def initWorker():
+    # every job is different, caching would only hold memory
+    geometry.geometryCacheBytes = 0
+    sphere.unitSphereCacheBytes = 0
+
+
+def runJob(index, job, outputDir, fileFormat):
+    name = str(job.get("name", "%s_%06d" % (job.get("type", "job"), index)))
+    path = os.path.join(outputDir, "%s.%s" % (name, fileFormat))
+    try:
+        generator = jobGenerator(job["type"])
+        params = dict(job.get("params", {}))
+        params.pop("topology", None)
+        geo = generator(**params)
+        writers[fileFormat](geo, path)
+    except Exception as error:
+        return {"index": index, "name": name, "error": repr(error)}
+    return {
+        "index": index,
+        "name": name,
+        "path": path,
+        "verts": int(geo.vertCount),
+        "faces": int(geo.faceCount)
+    }
+
+
+def runJobs(jobs, outputDir, fileFormat = "ply", processes = None,
+            maxPending = None):
+    """
+    Run the jobs in a process pool and yield their summaries in the order
+    of the jobs. Only `maxPending` jobs are submitted ahead.
+    """
+    processes = processes or cpu_count()
+    maxPending = maxPending or 4 * processes
+    os.makedirs(outputDir, exist_ok = True)
+
+    with Pool(processes, initializer = initWorker) as pool:
+        pending = deque()
+        for index, job in enumerate(jobs):
+            pending.append(pool.apply_async(
+                runJob, (index, job, outputDir, fileFormat)))
+            if len(pending) >= maxPending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "python -m wmesh_core",
+        description = "Generate WMeshes from a JSON/NDJSON job spec.")
+    parser.add_argument(
+        "spec",
+        help = "job spec file (JSON list or NDJSON, streamed), '-' for stdin")
+    parser.add_argument(
+        "--output-dir", default = ".", help = "where to write the meshes")
+    parser.add_argument(
+        "--format", choices = sorted(writers), default = "ply")
+    parser.add_argument(
+        "--processes", type = int, default = None,
+        help = "worker processes (default: all CPU cores)")
+    parser.add_argument(
+        "--max-pending", type = int, default = None,
+        help = "jobs queued ahead of the workers (default: 4 per worker)")
+    args = parser.parse_args(argv)
+
+    spec = sys.stdin if args.spec == "-" else open(args.spec)
+    failed = 0
+    try:
+        for result in runJobs(
+                readJobs(spec), args.output_dir, args.format,
+                args.processes, args.max_pending):
+            failed += "error" in result
+            sys.stdout.write(json.dumps(result) + "\n")
+    finally:
+        if spec is not sys.stdin:
+            spec.close()
+
+    return 1 if failed else 0
@@ -0,0 +1,132 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________15.12.2015______/
+# __Last_modified:__02.08.2018______/
+# __Version:________0.4_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a box-shaped mesh.
+"""
+
+import numpy as np
+from .geometry import (
+    WGeometry,
+    surfaceCounts,
+    bridgeLoops,
+    moveVerts,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+def gridBorder(lines):
+    """IDs around the grid, in the same direction as the z loops."""
+    return np.concatenate((
+        lines[0],
+        lines[1:-1, -1],
+        lines[-1, ::-1],
+        lines[-2:0:-1, 0]))
+
+
+@cachedGeometry
+def primitive_Box(
+                size_x = 2.0,
+                size_y = 2.0,
+                size_z = 2.0,
+                seg_x = 1,
+                seg_y = 1,
+                seg_z = 1,
+                centered = True,
+                topology = True):
+
+    if seg_x < 1:
+        seg_x = 1
+    if seg_y < 1:
+        seg_y = 1
+    if seg_z < 1:
+        seg_z = 1
+
+    geo = WGeometry(topology, countsWBox(
+        {"seg_x": seg_x, "seg_y": seg_y, "seg_z": seg_z}))
+
+    loops = []
+
+    dist_x = size_x / seg_x
+    dist_y = size_y / seg_y
+    dist_z = size_z / seg_z
+
+    steps_x = np.arange(seg_x + 1) * dist_x
+    steps_y = np.arange(seg_y + 1) * dist_y
+
+    # bottom grid
+    grid = np.zeros((seg_y + 1, seg_x + 1, 3), dtype=np.float32)
+    grid[:, :, 0] = steps_x
+    grid[:, :, 1] = steps_y[:, np.newaxis]
+    bottom_lines = geo.addVerts(grid).reshape(seg_y + 1, seg_x + 1)
+
+    # top grid
+    grid[:, :, 2] = size_z
+    top_lines = geo.addVerts(grid).reshape(seg_y + 1, seg_x + 1)
+
+    # bottom loop
+    loops.append(gridBorder(bottom_lines))
+
+    # z loops
+    perimeter = np.concatenate((
+        np.stack((steps_x, np.zeros(seg_x + 1)), axis = 1),
+        np.stack((np.full(seg_y - 1, size_x), steps_y[1:-1]), axis = 1),
+        np.stack((size_x - steps_x, np.full(seg_x + 1, size_y)), axis = 1),
+        np.stack((np.zeros(seg_y - 1), size_y - steps_y[1:-1]), axis = 1)))
+    for z in range(seg_z - 1):
+        loop = np.empty((len(perimeter), 3), dtype=np.float32)
+        loop[:, :2] = perimeter
+        loop[:, 2] = (z + 1) * dist_z
+        loops.append(geo.addVerts(loop))
+
+    # top loop
+    loops.append(gridBorder(top_lines))
+
+    if centered:
+        moveVerts(geo.coords, (-size_x / 2, -size_y / 2, -size_z / 2))
+
+    if not geo.topology:
+        return geo
+
+    # faces bottom
+    for i in range(seg_y):
+        geo.addFaces(bridgeLoops(bottom_lines[i+1], bottom_lines[i], False))
+
+    # faces top
+    for i in range(seg_y):
+        geo.addFaces(bridgeLoops(top_lines[i], top_lines[i + 1], False))
+
+    # faces sides
+    for i in range(seg_z):
+        geo.addFaces(bridgeLoops(loops[i], loops[i + 1], True))
+
+    return geo
+
+
+def topologyWBox(args):
+    return args["seg_x"], args["seg_y"], args["seg_z"]
+
+
+def countsWBox(args):
+    seg_x = max(args["seg_x"], 1)
+    seg_y = max(args["seg_y"], 1)
+    seg_z = max(args["seg_z"], 1)
+    return surfaceCounts(
+        2 * (seg_x + 1) * (seg_y + 1) + 2 * (seg_z - 1) * (seg_x + seg_y),
+        2 * seg_x * seg_y + 2 * seg_z * (seg_x + seg_y))
+
+
+def vertCountWBox(args):
+    return countsWBox(args).verts
+
+
+def previewWBox(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_x", 1), ("seg_y", 1), ("seg_z", 1)),
+        vertCountWBox)
@@ -0,0 +1,166 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________03.04.2018______/
+# __Last_modified:__02.08.2018______/
+# __Version:________0.2_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a capsule-shaped mesh.
+"""
+
+from math import (
+                    pi as PI,
+                    sin,
+                    cos
+)
+from .geometry import (
+                    WGeometry,
+                    surfaceCounts,
+                    circleVerts as circ_V,
+                    moveVerts as move_V,
+                    fanClose,
+                    bridgeLoops,
+                    cachedGeometry,
+                    reduceSegments
+)
+
+
+# Generating the vertices and polygons
+@cachedGeometry
+def primitive_Capsule_ME(
+        radius = 0.5,
+        height = 2.0,
+        seg_perimeter = 24,
+        seg_height = 1,
+        seg_caps = 8,
+        centered = True,
+        smoothed = True,
+        topology = True):
+
+    # Prepare empty geometry
+    geo = WGeometry(topology, countsWCapsule({
+        "radius": radius,
+        "height": height,
+        "seg_perimeter": seg_perimeter,
+        "seg_height": seg_height,
+        "seg_caps": seg_caps}))
+
+    loops = []
+
+    # Set minimums
+    if seg_perimeter < 3:
+        seg_perimeter = 3
+    if seg_height < 1:
+        seg_height = 1
+    if seg_caps < 1:
+        seg_caps = 1
+    if radius > height / 2:
+        radius = height / 2
+
+    # Add top and bottom center vertices
+    geo.addVerts(((0, 0, 0), (0, 0, height)))
+
+    # Create bootom cap segmentation loops
+    if seg_caps > 1:
+        angleStep = PI / (2 * seg_caps)
+        for i in range(1, seg_caps):
+            # find the radius and height
+            segmentRadius = radius * sin(i * angleStep)
+            segmentHeight = radius - (radius * cos(i * angleStep))
+            # create the ring
+            newVerts, loop = circ_V(
+                segmentRadius, seg_perimeter, geo.vertCount)
+            move_V(newVerts, (0, 0, segmentHeight))
+            geo.addVerts(newVerts)
+            loops.append(loop)
+
+    # Create the base corner circle
+    newVerts, loop = circ_V(radius, seg_perimeter, geo.vertCount)
+    move_V(newVerts, (0, 0, radius))
+    geo.addVerts(newVerts)
+    loops.append(loop)
+
+    # Create the side segmentation loops
+    if height > 2 * radius:
+        if seg_height > 1:
+            heightStep = (height - (2 * radius)) / seg_height
+            for i in range(1, seg_height):
+                newHeight = (i * heightStep) + radius
+                newVerts, loop = circ_V(radius, seg_perimeter, geo.vertCount)
+                move_V(newVerts, (0, 0, newHeight))
+                geo.addVerts(newVerts)
+                loops.append(loop)
+
+    # Create top corner circle
+        newVerts, loop = circ_V(radius, seg_perimeter, geo.vertCount)
+        move_V(newVerts, (0, 0, height - radius))
+        geo.addVerts(newVerts)
+        loops.append(loop)
+
+    # Create top cap segmentation loops
+    if seg_caps > 1:
+        angleStep = PI / (2 * seg_caps)
+        for i in range(1, seg_caps):
+            # find the radius and height
+            segmentRadius = radius * cos(i * angleStep)
+            segmentHeight = height - radius + (radius * sin(i * angleStep))
+            # create the ring
+            newVerts, loop = circ_V(
+                segmentRadius, seg_perimeter, geo.vertCount)
+            move_V(newVerts, (0, 0, segmentHeight))
+            geo.addVerts(newVerts)
+            loops.append(loop)
+
+    if centered:
+        move_V(geo.coords, (0, 0, -height / 2))
+
+    if not geo.topology:
+        return geo
+
+    # Close caps
+    geo.addFaces(fanClose(loops[0], 0, flipped = True))
+    geo.addFaces(fanClose(loops[-1], 1))
+
+    # Bridge all loops
+    for i in range(1, len(loops)):
+        geo.addFaces(bridgeLoops(loops[i - 1], loops[i], True))
+
+    return geo
+
+
+def topologyWCapsule(args):
+    radius = min(args["radius"], args["height"] / 2)
+    return (
+        max(args["seg_perimeter"], 3),
+        max(args["seg_height"], 1),
+        max(args["seg_caps"], 1),
+        radius > 0,
+        args["height"] > 2 * radius)
+
+
+def countsWCapsule(args):
+    seg_perimeter, seg_height, seg_caps, rounded, side = (
+        topologyWCapsule(args))
+    loops = 2 * seg_caps - 1 + side * seg_height
+
+    # a zero radius collapses every loop into one vertex
+    loopVerts = seg_perimeter if rounded else 1
+    counts = surfaceCounts(
+        2 + loops * loopVerts,
+        (loops - 1) * loopVerts,
+        2 * loopVerts)
+    if not rounded:
+        counts = counts._replace(edges = counts.verts - 1)
+    return counts
+
+
+def vertCountWCapsule(args):
+    return countsWCapsule(args).verts
+
+
+def previewWCapsule(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_perimeter", 3), ("seg_height", 1), ("seg_caps", 1)),
+        vertCountWCapsule)
@@ -0,0 +1,151 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________16.12.2015______/
+# __Last_modified:__02.08.2018______/
+# __Version:________0.4_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a cone-shaped mesh.
+"""
+
+from .geometry import (
+    WGeometry,
+    WCounts,
+    surfaceCounts,
+    circleVerts as circ_V,
+    moveVerts as move_V,
+    fanClose,
+    bridgeLoops,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+# Generating the vertices and polygons
+@cachedGeometry
+def primitive_Cone_ME(
+        radius_main = 1.0,
+        radius_top = 0.0,
+        height = 2.0,
+        seg_perimeter = 24,
+        seg_height = 1,
+        seg_radius = 1,
+        centered = False,
+        smoothed = True,
+        topology = True):
+
+    # Prepare empty geometry
+    geo = WGeometry(topology, countsWCone({
+        "radius_main": radius_main,
+        "radius_top": radius_top,
+        "seg_perimeter": seg_perimeter,
+        "seg_height": seg_height,
+        "seg_radius": seg_radius}))
+
+    loops = []
+
+    # Set minimums
+    if seg_perimeter < 3:
+        seg_perimeter = 3
+    if seg_height < 1:
+        seg_height = 1
+    if seg_radius < 1:
+        seg_radius = 1
+
+    # Add top and bottom center vertices
+    geo.addVerts(((0, 0, 0), (0, 0, height)))
+
+    if radius_top == 0 and radius_main == 0:
+        geo.addEdges((0, 1))
+        return geo
+
+    # Create base segmentation loops
+    if radius_main > 0:
+        if seg_radius > 1:
+            step = radius_main / seg_radius
+            for i in range(1, seg_radius):
+                newVerts, loop = circ_V(i * step, seg_perimeter, geo.vertCount)
+                geo.addVerts(newVerts)
+                loops.append(loop)
+
+        # Create the base corner circle
+        newVerts, loop = circ_V(radius_main, seg_perimeter, geo.vertCount)
+        geo.addVerts(newVerts)
+        loops.append(loop)
+
+    # Create the side segmentation loops
+    if seg_height > 1:
+        heightStep = height / seg_height
+        radiusStep = (radius_top - radius_main) / seg_height
+        for i in range(1, seg_height):
+            newRadius = radius_main + (i * radiusStep)
+            newVerts, loop = circ_V(newRadius, seg_perimeter, geo.vertCount)
+            move_V(newVerts, (0, 0, heightStep * i))
+            geo.addVerts(newVerts)
+            loops.append(loop)
+
+    # Create top corner circle
+    if radius_top > 0:
+        newVerts, loop = circ_V(radius_top, seg_perimeter, geo.vertCount)
+        move_V(newVerts, (0, 0, height))
+        geo.addVerts(newVerts)
+        loops.append(loop)
+
+        # Create the top segmentation loops
+        if seg_radius > 1:
+            step = radius_top / seg_radius
+            for i in range(1, seg_radius):
+                newRadius = radius_top - (i * step)
+                newVerts, loop = circ_V(
+                    newRadius, seg_perimeter, geo.vertCount)
+                move_V(newVerts, (0, 0, height))
+                geo.addVerts(newVerts)
+                loops.append(loop)
+
+    if centered:
+        move_V(geo.coords, (0, 0, -height / 2))
+
+    if not geo.topology:
+        return geo
+
+    # Close caps
+    geo.addFaces(fanClose(loops[0], 0, closed = True, flipped = True))
+    geo.addFaces(fanClose(loops[-1], 1))
+
+    # Bridge all loops
+    for i in range(1, len(loops)):
+        geo.addFaces(bridgeLoops(loops[i - 1], loops[i], True))
+
+    return geo
+
+
+def topologyWCone(args):
+    return (
+        max(args["seg_perimeter"], 3),
+        max(args["seg_height"], 1),
+        max(args["seg_radius"], 1),
+        args["radius_main"] > 0,
+        args["radius_top"] > 0)
+
+
+def countsWCone(args):
+    seg_perimeter, seg_height, seg_radius, base, top = topologyWCone(args)
+    if not base and not top:
+        return WCounts(2, 1, 0, 0)
+    loops = seg_height - 1 + (base + top) * seg_radius
+    return surfaceCounts(
+        2 + loops * seg_perimeter,
+        (loops - 1) * seg_perimeter,
+        2 * seg_perimeter)
+
+
+def vertCountWCone(args):
+    return countsWCone(args).verts
+
+
+def previewWCone(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_perimeter", 3), ("seg_height", 1), ("seg_radius", 1)),
+        vertCountWCone)
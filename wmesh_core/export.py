@@ -0,0 +1,72 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________18.10.2026______/
+# __Last_modified:__18.10.2026______/
+# __Version:________0.1_____________/
+# __________________________________/
+
+"""
+Writes a WGeometry to a file without going through Blender.
+"""
+
+import numpy as np
+
+
+def writePLY(geo, path):
+    """Binary little endian PLY with vertices, faces and loose edges."""
+    coords = geo.coords
+    edges = geo.edges
+    blocks = geo.faceBlocks
+
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        "element vertex %d" % len(coords),
+        "property float x",
+        "property float y",
+        "property float z",
+        "element face %d" % geo.faceCount,
+        "property list uchar int vertex_indices"]
+    if len(edges):
+        header += [
+            "element edge %d" % len(edges),
+            "property int vertex1",
+            "property int vertex2"]
+    header.append("end_header\n")
+
+    with open(path, "wb") as output:
+        output.write("\n".join(header).encode("ascii"))
+        output.write(np.ascontiguousarray(coords, dtype="<f4").tobytes())
+
+        # one record per face: the corner count and the vertex indices
+        for block in blocks:
+            corners = block.shape[1]
+            records = np.empty(len(block), dtype=[
+                ("count", "u1"), ("verts", "<i4", (corners,))])
+            records["count"] = corners
+            records["verts"] = block
+            output.write(records.tobytes())
+
+        if len(edges):
+            output.write(np.ascontiguousarray(edges, dtype="<i4").tobytes())
+
+
+def writeOBJ(geo, path):
+    """Wavefront OBJ, the faces and the loose edges as 'f' and 'l' lines."""
+    with open(path, "w") as output:
+        np.savetxt(output, geo.coords, fmt="v %.6g %.6g %.6g")
+
+        # OBJ indices start with 1
+        for block in geo.faceBlocks:
+            fmt = "f" + " %d" * block.shape[1]
+            np.savetxt(output, block + 1, fmt=fmt)
+
+        edges = geo.edges
+        if len(edges):
+            np.savetxt(output, edges + 1, fmt="l %d %d")
+
+
+writers = {
+    "ply": writePLY,
+    "obj": writeOBJ
+}
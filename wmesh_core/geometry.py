@@ -0,0 +1,485 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________15.12.2015______/
+# __Last_modified:__31.03.2018______/
+# __Version:________0.4_____________/
+# __________________________________/
+
+"""
+Array geometry shared by the generators. Nothing here depends on Blender.
+"""
+
+import numpy as np
+import threading
+from collections import namedtuple, OrderedDict
+from functools import wraps
+from inspect import signature
+from math import pi
+
+
+# Everything in a mesh except the vertex positions
+WTopology = namedtuple("WTopology", (
+    "vertCount", "edges", "loopVerts", "loopStarts", "loopTotals"))
+
+# Sizes of a mesh, as Blender counts them (edges of the faces included)
+WCounts = namedtuple("WCounts", ("verts", "edges", "faces", "loops"))
+
+# (generator, arguments) -> WGeometry, bounded by geometryCacheBytes
+geometryCache = OrderedDict()
+geometryCacheBytes = 256 * 1024 * 1024
+geometryCacheStats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+# the generators may also run in worker threads
+geometryCacheLock = threading.Lock()
+
+# (segments, sector_from, sector_to) -> cos and sin of the circleAngles,
+# the most recent ones only
+trigTableCache = OrderedDict()
+trigTableCacheSize = 64
+trigTableLock = threading.Lock()
+
+
+class WGeometry:
+    """
+    Array backed mesh data shared by all the generators.
+
+    Vertices are stored as Nx3 float32 coordinates, edges as Ex2 int32
+    indices and faces as blocks of int32 indices, one block per bulk
+    operation (every row of a block is one polygon).
+    """
+
+    def __init__(self, topology = True, counts = None):
+        # without topology only the vertex positions are collected
+        self.topology = topology
+        self._coords = []
+        self._edges = []
+        self._faces = []
+        self.vertCount = 0
+
+        # with known WCounts the arrays are filled into buffers allocated
+        # once, the blocks are views of them
+        self._coordBuffer = None
+        self._loopBuffer = None
+        self._totalBuffer = None
+        self._loopCount = 0
+        self._faceCount = 0
+        if counts is not None:
+            self._coordBuffer = np.empty((counts.verts, 3), dtype=np.float32)
+            if topology:
+                self._loopBuffer = np.empty(counts.loops, dtype=np.int32)
+                self._totalBuffer = np.empty(counts.faces, dtype=np.int32)
+
+    def addVerts(self, coords):
+        """Append the coordinates and return the IDs of the new vertices."""
+        coords = np.asarray(coords, dtype=np.float32).reshape(-1, 3)
+        start = self.vertCount
+        end = start + len(coords)
+        buffer = self._coordBuffer
+        if buffer is not None and end <= len(buffer):
+            buffer[start:end] = coords
+            coords = buffer[start:end]
+        else:
+            # more vertices than counted, fall back to concatenation
+            self._coordBuffer = None
+            coords = coords.copy()
+        self._coords.append(coords)
+        self.vertCount = end
+        return np.arange(start, end, dtype=np.int32)
+
+    def addEdges(self, edges):
+        if not self.topology:
+            return
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        if len(edges):
+            self._edges.append(edges)
+
+    def addFaces(self, faces):
+        if not self.topology or faces is None or len(faces) == 0:
+            return
+        faces = np.asarray(faces, dtype=np.int32)
+        loopStart = self._loopCount
+        loopEnd = loopStart + faces.size
+        faceStart = self._faceCount
+        faceEnd = faceStart + len(faces)
+        if self._loopBuffer is not None and (
+                loopEnd <= len(self._loopBuffer) and
+                faceEnd <= len(self._totalBuffer)):
+            block = self._loopBuffer[loopStart:loopEnd].reshape(faces.shape)
+            block[:] = faces
+            self._totalBuffer[faceStart:faceEnd] = faces.shape[1]
+            faces = block
+        else:
+            self._loopBuffer = None
+            self._totalBuffer = None
+        self._faces.append(faces)
+        self._loopCount = loopEnd
+        self._faceCount = faceEnd
+
+    @property
+    def coords(self):
+        buffer = self._coordBuffer
+        if buffer is not None and self.vertCount == len(buffer):
+            self._coords = [buffer]
+        if len(self._coords) != 1:
+            if self._coords:
+                self._coords = [np.concatenate(self._coords)]
+            else:
+                self._coords = [np.empty((0, 3), dtype=np.float32)]
+        return self._coords[0]
+
+    @property
+    def edges(self):
+        if self._edges:
+            return np.concatenate(self._edges)
+        return np.empty((0, 2), dtype=np.int32)
+
+    @property
+    def faceBlocks(self):
+        """The face blocks, every block is an (n, corners) array."""
+        return tuple(self._faces)
+
+    @property
+    def faceCount(self):
+        return self._faceCount
+
+    def faceBuffers(self):
+        """
+        Return the faces as flat buffers: the vertex index of every loop,
+        the first loop of every polygon and the loop count of every polygon.
+        """
+        if not self._faces:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty, empty
+        if self._loopBuffer is not None and (
+                self._loopCount == len(self._loopBuffer) and
+                self._faceCount == len(self._totalBuffer)):
+            loopVerts = self._loopBuffer
+            loopTotals = self._totalBuffer
+        else:
+            loopVerts = np.concatenate(
+                [block.ravel() for block in self._faces])
+            loopTotals = np.concatenate([
+                np.full(len(block), block.shape[1], dtype=np.int32)
+                for block in self._faces])
+        loopStarts = np.zeros(len(loopTotals), dtype=np.int32)
+        np.cumsum(loopTotals[:-1], out=loopStarts[1:])
+        return loopVerts, loopStarts, loopTotals
+
+    @property
+    def nbytes(self):
+        return (
+            self.coords.nbytes +
+            sum(edges.nbytes for edges in self._edges) +
+            sum(block.nbytes for block in self._faces))
+
+    def freeze(self):
+        """Make the arrays read-only (shared by the cache), return nbytes."""
+        self.coords.setflags(write = False)
+        for array in self._edges + self._faces:
+            array.setflags(write = False)
+        if self._totalBuffer is not None:
+            self._loopBuffer.setflags(write = False)
+            self._totalBuffer.setflags(write = False)
+        return self.nbytes
+
+    def getTopology(self):
+        return WTopology(self.vertCount, self.edges, *self.faceBuffers())
+
+
+def cachedGeometry(generator):
+    """
+    Decorator of the generators. The geometry is looked up in the process
+    wide LRU cache by the generator and all its arguments (defaults
+    included), so repeated settings are generated only once. The cached
+    arrays are read-only.
+    """
+    parameters = signature(generator)
+
+    @wraps(generator)
+    def cachedGenerator(*args, **kwargs):
+        arguments = parameters.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        key = (
+            generator.__module__, generator.__name__,
+            tuple(arguments.arguments.items()))
+
+        with geometryCacheLock:
+            geo = geometryCache.get(key)
+            if geo is not None:
+                geometryCache.move_to_end(key)
+                geometryCacheStats["hits"] += 1
+                return geo
+            geometryCacheStats["misses"] += 1
+
+        geo = generator(*args, **kwargs)
+        size = geo.freeze()
+        if size > geometryCacheBytes:
+            return geo
+
+        with geometryCacheLock:
+            if key in geometryCache:
+                return geometryCache[key]
+            geometryCache[key] = geo
+            geometryCacheStats["bytes"] += size
+            while geometryCacheStats["bytes"] > geometryCacheBytes:
+                _, old = geometryCache.popitem(last = False)
+                geometryCacheStats["bytes"] -= old.nbytes
+                geometryCacheStats["evictions"] += 1
+        return geo
+
+    return cachedGenerator
+
+
+def geometryCacheInfo():
+    info = dict(geometryCacheStats)
+    info["entries"] = len(geometryCache)
+    info["max_bytes"] = geometryCacheBytes
+    return info
+
+
+def clearGeometryCache():
+    """Empty the cache and start its statistics over."""
+    with geometryCacheLock:
+        geometryCache.clear()
+        for stat in geometryCacheStats:
+            geometryCacheStats[stat] = 0
+
+
+def surfaceCounts(verts, quads, tris = 0, euler = 2):
+    """
+    WCounts of a closed-up surface of quads and triangles, the edges follow
+    from its Euler characteristic (2 sphere, 1 disk, 0 tube or torus).
+    """
+    faces = quads + tris
+    return WCounts(verts, verts + faces - euler, faces, 4 * quads + 3 * tris)
+
+
+def reduceSegments(args, budget, segments, vertCount):
+    """
+    Preview arguments: the segmentation given by `segments` (name, minimum)
+    is halved until `vertCount(args)` fits in the budget of vertices.
+    """
+    args = dict(args)
+    while vertCount(args) > budget:
+        reduced = False
+        for name, minimum in segments:
+            if args[name] > minimum:
+                args[name] = max(minimum, args[name] // 2)
+                reduced = True
+        if not reduced:
+            break
+    return args
+
+
+def circleAngles(seg: int, sector_from = 0.0, sector_to = 2 * pi):
+    """
+    Angles of the vertices on a circle with `seg` segments. An open sector
+    gets one more vertex to close the last segment.
+    """
+    stepAngle = (sector_to - sector_from) / seg
+    number = seg
+    if sector_to - sector_from < 2 * pi:
+        number = seg + 1
+    return (np.arange(number) * stepAngle) + sector_from
+
+
+def circleTable(seg: int, sector_from = 0.0, sector_to = 2 * pi):
+    """
+    Cosines and sines of circleAngles(seg, sector_from, sector_to), shared
+    by all the loops and generators through an LRU cache (read-only).
+    """
+    key = (seg, sector_from, sector_to)
+    with trigTableLock:
+        table = trigTableCache.get(key)
+        if table is not None:
+            trigTableCache.move_to_end(key)
+            return table
+
+    angles = circleAngles(seg, sector_from, sector_to)
+    table = np.cos(angles), np.sin(angles)
+    for array in table:
+        array.setflags(write = False)
+
+    with trigTableLock:
+        trigTableCache[key] = table
+        while len(trigTableCache) > trigTableCacheSize:
+            trigTableCache.popitem(last = False)
+    return table
+
+
+def clearTrigTableCache():
+    with trigTableLock:
+        trigTableCache.clear()
+
+
+def tableCoords(radius: float, table, height = 0.0):
+    """Coordinates of a loop from its circleTable."""
+    cosines, sines = table
+    coords = np.empty((len(cosines), 3), dtype=np.float32)
+    coords[:, 0] = radius * cosines
+    coords[:, 1] = radius * sines
+    coords[:, 2] = height
+    return coords
+
+
+def ringCoords(radii, table, heights):
+    """
+    Coordinates of one loop of the circleTable per radius and height,
+    shaped (rings, len(table[0]), 3).
+    """
+    cosines, sines = table
+    radii, heights = np.broadcast_arrays(
+        np.asarray(radii, dtype=np.float64).reshape(-1),
+        np.asarray(heights, dtype=np.float64).reshape(-1))
+    coords = np.empty((len(radii), len(cosines), 3), dtype=np.float32)
+    coords[:, :, 0] = np.outer(radii, cosines)
+    coords[:, :, 1] = np.outer(radii, sines)
+    coords[:, :, 2] = heights[:, np.newaxis]
+    return coords
+
+
+def circleCoords(radius, angles, height = 0.0):
+    """
+    Coordinates of points at arbitrary angles, the radius and height may
+    also be given per point.
+    """
+    return tableCoords(radius, (np.cos(angles), np.sin(angles)), height)
+
+
+def circleVerts(radius: float, seg: int, IDs_Offset: int):
+    if radius <= 0:
+        return (
+            np.zeros((1, 3), dtype=np.float32),
+            np.array([IDs_Offset], dtype=np.int32))
+
+    if seg < 3:
+        seg = 3
+
+    verts = tableCoords(radius, circleTable(seg))
+    vertIDs = np.arange(IDs_Offset, IDs_Offset + seg, dtype=np.int32)
+
+    return verts, vertIDs
+
+
+def moveVerts(verts, offset):
+    verts += np.asarray(offset, dtype=np.float32)
+
+
+def bridgeLoops(loop1, loop2, close):
+    loop1 = np.asarray(loop1, dtype=np.int32)
+    loop2 = np.asarray(loop2, dtype=np.int32)
+
+    if len(loop1) != len(loop2):
+        return None
+
+    if close:
+        nextIDs = np.roll(np.arange(len(loop1)), -1)
+        thisIDs = np.arange(len(loop1))
+    else:
+        nextIDs = np.arange(1, len(loop1))
+        thisIDs = nextIDs - 1
+
+    return np.stack((
+        loop1[thisIDs], loop1[nextIDs], loop2[nextIDs], loop2[thisIDs]),
+        axis = 1)
+
+
+def bridgeStrip(loops, close):
+    """
+    bridgeLoops of every two neighbouring rows of the 2D array `loops`,
+    in order, as one block of quads.
+    """
+    loops = np.asarray(loops, dtype=np.int32)
+    if close:
+        thisIDs = loops
+        nextIDs = np.roll(loops, -1, axis = 1)
+    else:
+        thisIDs = loops[:, :-1]
+        nextIDs = loops[:, 1:]
+
+    return np.stack((
+        thisIDs[:-1], nextIDs[:-1], nextIDs[1:], thisIDs[1:]),
+        axis = 2).reshape(-1, 4)
+
+
+def fanClose(loop, point, closed = True, flipped = False):
+    loop = np.asarray(loop, dtype=np.int32)
+
+    if closed:
+        prevIDs = np.roll(loop, 1)
+        nextIDs = loop
+    else:
+        prevIDs = loop[:-1]
+        nextIDs = loop[1:]
+
+    points = np.full(len(nextIDs), point, dtype=np.int32)
+    if flipped:
+        return np.stack((prevIDs, points, nextIDs), axis = 1)
+    return np.stack((prevIDs, nextIDs, points), axis = 1)
+
+
+# subsurf
+def findEdges(faces):
+    """
+    Find the unique edges of faces of the same size. Returns the edges
+    (pairs of vertex IDs, numbered in the order of their first appearance)
+    and the borders (edge IDs around every face).
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if faces.size == 0:
+        return (
+            np.empty((0, 2), dtype=np.int32),
+            np.empty(faces.shape, dtype=np.int32))
+
+    # sort indexes
+    nextIDs = np.roll(faces, -1, axis = 1)
+    edgeA = np.minimum(faces, nextIDs).ravel()
+    edgeB = np.maximum(faces, nextIDs).ravel()
+
+    # hash every edge to one integer and index them through a sort
+    keys = edgeA * (int(faces.max()) + 1) + edgeB
+    _, first, inverse = np.unique(
+        keys, return_index = True, return_inverse = True)
+
+    # keep the order in which the edges appear
+    order = np.argsort(first)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+
+    edges = np.stack((edgeA, edgeB), axis = 1)[first[order]]
+    borders = ranks[inverse.ravel()].reshape(faces.shape)
+
+    return edges.astype(np.int32), borders.astype(np.int32)
+
+
+def subdivide(verts, edges, faces, tris):
+    """
+    Subdivide one whole level at once. `verts` is an Nx3 array and `faces`
+    an array of faces of the same size (triangles when `tris` is set).
+    """
+    verts = np.asarray(verts)
+    faces = np.asarray(faces, dtype=np.int32)
+    Sedges, borders = findEdges(faces)
+    vertIDsOffset = len(verts)
+    borders = borders + vertIDsOffset
+    prevBorders = np.roll(borders, 1, axis = 1)
+
+    # midpoints
+    midVerts = (verts[Sedges[:, 0]] + verts[Sedges[:, 1]]) / 2
+
+    if not tris:
+        centerVerts = verts[faces].mean(axis = 1)
+        centerIDs = np.arange(
+            len(faces), dtype=np.int32) + vertIDsOffset + len(Sedges)
+        NewFaces = np.stack((
+            faces,
+            borders,
+            np.broadcast_to(centerIDs[:, np.newaxis], faces.shape),
+            prevBorders), axis = 2).reshape(-1, 4)
+        verts = np.concatenate((verts, midVerts, centerVerts))
+    else:
+        cornerFaces = np.stack((faces, borders, prevBorders), axis = 2)
+        NewFaces = np.concatenate(
+            (cornerFaces, borders[:, np.newaxis, :3]), axis = 1).reshape(-1, 3)
+        verts = np.concatenate((verts, midVerts))
+
+    return verts, edges, NewFaces
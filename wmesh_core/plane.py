@@ -0,0 +1,78 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________15.12.2015______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.4_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a plane-shaped mesh.
+"""
+
+import numpy as np
+from .geometry import (
+    WGeometry,
+    WCounts,
+    bridgeStrip,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+@cachedGeometry
+def WPlane_mesh(
+        size_x = 2.0,
+        size_y = 2.0,
+        seg_x = 1,
+        seg_y = 1,
+        centered = True,
+        topology = True):
+
+    geo = WGeometry(topology, countsWPlane(
+        {"seg_x": seg_x, "seg_y": seg_y}))
+
+    dist_x = size_x / seg_x
+    dist_y = size_y / seg_y
+
+    # the axes of the grid, already centered
+    xs = np.arange(seg_x + 1) * dist_x
+    ys = np.arange(seg_y + 1) * dist_y
+    if centered:
+        xs -= size_x / 2
+        ys -= size_y / 2
+
+    grid = np.zeros((seg_y + 1, seg_x + 1, 3), dtype=np.float32)
+    grid[:, :, 0] = xs
+    grid[:, :, 1] = ys[:, np.newaxis]
+    lines = geo.addVerts(grid).reshape(seg_y + 1, seg_x + 1)
+
+    if not geo.topology:
+        return geo
+
+    geo.addFaces(bridgeStrip(lines, False))
+
+    return geo
+
+
+def topologyWPlane(args):
+    return args["seg_x"], args["seg_y"]
+
+
+def countsWPlane(args):
+    seg_x, seg_y = args["seg_x"], args["seg_y"]
+    return WCounts(
+        (seg_x + 1) * (seg_y + 1),
+        2 * seg_x * seg_y + seg_x + seg_y,
+        seg_x * seg_y,
+        4 * seg_x * seg_y)
+
+
+def vertCountWPlane(args):
+    return countsWPlane(args).verts
+
+
+def previewWPlane(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_x", 1), ("seg_y", 1)),
+        vertCountWPlane)
@@ -0,0 +1,134 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________16.12.2015______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.3_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a ring-shaped mesh.
+"""
+
+import numpy as np
+from math import pi
+from .geometry import (
+    WGeometry,
+    WCounts,
+    circleTable,
+    tableCoords,
+    bridgeLoops,
+    fanClose,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+@cachedGeometry
+def primitive_Ring(
+                radius_out = 1.0,
+                use_inner = True,
+                radius_in = 0.0,
+                seg_perimeter = 24,
+                seg_radius = 1,
+                sector_from = 0.0,
+                sector_to = 2 * pi,
+                topology = True):
+
+    geo = WGeometry(topology, countsWRing({
+        "radius_out": radius_out,
+        "radius_in": radius_in,
+        "use_inner": use_inner,
+        "seg_perimeter": seg_perimeter,
+        "seg_radius": seg_radius,
+        "sector_from": sector_from,
+        "sector_to": sector_to}))
+
+    loops = []
+
+    # make sure of what is bigger
+    if radius_out < radius_in:
+        radius_in, radius_out = radius_out, radius_in
+
+    if sector_from > sector_to:
+        sector_to, sector_from = sector_from, sector_to
+
+    if (radius_out - radius_in) < 0.0001:
+        use_inner = False
+
+    if seg_perimeter < 3:
+        seg_perimeter = 3
+
+    stepRadius = (radius_out - radius_in) / seg_radius
+
+    loop_number = seg_radius
+    if radius_in > 0.0001:
+        loop_number = seg_radius + 1
+
+    table = circleTable(seg_perimeter, sector_from, sector_to)
+    closed = len(table[0]) == seg_perimeter
+
+    if use_inner:
+        for r in range(loop_number):
+            loops.append(geo.addVerts(
+                tableCoords(radius_out - (r * stepRadius), table)))
+
+        # fill the loops
+        for i in range(len(loops) - 1):
+            geo.addFaces(bridgeLoops(loops[i], loops[i + 1], closed))
+
+        # one point in the middle
+        if loop_number == seg_radius:
+            center = geo.addVerts((0.0, 0.0, 0.0))[0]
+            geo.addFaces(fanClose(loops[-1], center, closed = False))
+            if closed:
+                geo.addFaces(((loops[-1][-1], loops[-1][0], center),))
+
+    else:
+        loop = geo.addVerts(tableCoords(radius_out, table))
+        geo.addEdges(np.stack((loop[:-1], loop[1:]), axis = 1))
+        if closed:
+            geo.addEdges((loop[-1], loop[0]))
+
+    return geo
+
+
+def topologyWRing(args):
+    radius_in = min(args["radius_out"], args["radius_in"])
+    thickness = abs(args["radius_out"] - args["radius_in"])
+    sector = abs(args["sector_to"] - args["sector_from"])
+    return (
+        max(args["seg_perimeter"], 3),
+        args["seg_radius"],
+        args["use_inner"] and thickness >= 0.0001,
+        radius_in > 0.0001,
+        sector < 2 * pi)
+
+
+def countsWRing(args):
+    seg_perimeter, seg_radius, use_inner, hole, open_sector = (
+        topologyWRing(args))
+    loopVerts = seg_perimeter + open_sector
+
+    if not use_inner:
+        return WCounts(loopVerts, seg_perimeter, 0, 0)
+
+    loop_number = seg_radius + hole
+    center = not hole
+    quads = (loop_number - 1) * seg_perimeter
+    tris = seg_perimeter if center else 0
+    return WCounts(
+        loop_number * loopVerts + center,
+        loop_number * seg_perimeter + (loop_number - 1 + center) * loopVerts,
+        quads + tris,
+        4 * quads + 3 * tris)
+
+
+def vertCountWRing(args):
+    return countsWRing(args).verts
+
+
+def previewWRing(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_perimeter", 3), ("seg_radius", 1)),
+        vertCountWRing)
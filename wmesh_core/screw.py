@@ -0,0 +1,272 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________15.12.2015______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.3_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a screw-shaped mesh.
+"""
+
+import numpy as np
+from math import pi
+from .geometry import (
+    WGeometry,
+    bridgeLoops,
+    surfaceCounts,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+def getHeight(j, i, layers, height, addition, segments, layerHeight):
+    if j == 0:
+        return 0
+    elif j == layers - 1:
+        return height
+    else:
+        if j == 1:
+            return (i * addition) / 2
+        elif j == layers - 2:
+            if i == 0:
+                return (height - (3 * layerHeight))
+            else:
+                return height - (((segments - i) * addition) / 2)
+        else:
+            if j == 3 or j == 4:
+                if i == 0:
+                    return ((j - 2)*layerHeight) + (addition / 2)
+                else:
+                    return ((j - 2)*layerHeight) + (i * addition)
+            elif j == layers - 4 or j == layers - 5:
+                if i == segments - 1:
+                    a = ((layers - j - 3) * layerHeight)
+                    return height - a - (addition / 2)
+                else:
+                    return ((j - 2) * layerHeight) + (i * addition)
+            else:
+                return ((j - 2) * layerHeight) + (i * addition)
+
+
+def getAngle(j, i, angle, layers, segments):
+    if j == 1 and i == 2:
+        return (angle * 2.2)
+    elif j == layers - 2 and i == segments - 2:
+        return ((2 * pi) - (angle * 2.2))
+    elif j == 3 or j == 4:
+        if i == 0:
+            return (angle / 2)
+        elif i == segments and layers == 8:
+            return ((2 * pi) - (angle / 2))
+        else:
+            return (angle * i)
+    elif j == layers - 4 or j == layers - 5:
+        if i == segments:
+            return ((2 * pi) - (angle / 2))
+        else:
+            return (angle * i)
+    else:
+        return (angle * i)
+
+
+def getRadius(j, i, layers, segments, radius_1, radius_2):
+    if j == 0 or j == layers - 1 or j % 4 == 1 or j % 4 == 2:
+        return radius_1
+    elif (
+        (j == 3 or j == 4) and i == 0) or(
+            (j == layers - 4 or j == layers - 5) and i == segments):
+        return ((radius_1 + radius_2) / 2)
+    else:
+        return radius_2
+
+
+@cachedGeometry
+def primitive_Screw(
+                rounds = 5,
+                segments = 12,
+                height = 2.0,
+                radius_1 = 0.5,
+                radius_2 = 0.6,
+                smoothed = True,
+                topology = True):
+
+    if rounds < 1:
+        rounds = 1
+    if segments < 4:
+        segments = 4
+    if radius_1 < 0:
+        radius_1 = 0
+    if radius_2 < 0:
+        radius_2 < 0
+
+    # ...precompute some values
+    layers = (rounds + 1) * 4
+    layerHeight = height / (layers - 1)
+    addition = (layerHeight * 4) / segments
+    angle = (2 * pi) / segments
+
+    # ...the layers 5 to layers - 6 repeat one round, the others are
+    # generated from the tables
+    middle = np.arange(5, layers - 5)
+    rows = np.concatenate((np.arange(5), np.arange(5 + len(middle), layers)))
+
+    # ...the start and the end of the thread, segments + 1 values a layer
+    J = rows[:, np.newaxis]
+    I = np.arange(segments + 1)
+    shape = (len(rows), segments + 1)
+    heights = ((J - 2) * layerHeight) + (I * addition)
+    angles = np.broadcast_to(angle * I, shape).copy()
+    radii = np.broadcast_to(np.where(
+        (J % 4 == 1) | (J % 4 == 2), radius_1, radius_2), shape).copy()
+    special = {0, 1, 3, 4, layers - 5, layers - 4, layers - 2, layers - 1}
+    for row, j in enumerate(rows):
+        if j not in special:
+            continue
+        for i in range(segments + 1):
+            heights[row, i] = getHeight(
+                j, i, layers, height, addition, segments, layerHeight)
+            angles[row, i] = getAngle(j, i, angle, layers, segments)
+            radii[row, i] = getRadius(
+                j, i, layers, segments, radius_1, radius_2)
+
+    # ...where are vertices missing from loops
+    non1 = (I == segments) & ~((J == layers - 4) | (J == layers - 5))
+    non2 = ((J == 1) | (J == 2)) & (I < 2)
+    non3 = ((J == layers - 2) | (J == layers - 3)) & (I > segments - 2)
+    present = ~(non1 | non2 | non3)
+    tableCoords = np.stack((
+        radii * np.cos(angles),
+        radii * np.sin(angles),
+        heights), axis = 2)[present]
+    startCount = present[:5].sum()
+
+    # ...one round of the middle (its radii go r1, r1, r2, r2) tiled over
+    # all the middle layers, only the heights grow
+    roundRows = np.arange(5, 9)[:, np.newaxis]
+    roundRadii = np.where(
+        (roundRows % 4 == 1) | (roundRows % 4 == 2), radius_1, radius_2)
+    roundAngles = angle * I[:-1]
+    roundCoords = np.stack((
+        roundRadii * np.cos(roundAngles),
+        roundRadii * np.sin(roundAngles)), axis = 2)
+    tiles = -(-len(middle) // 4)
+    middleCoords = np.empty((len(middle), segments, 3))
+    middleCoords[:, :, :2] = np.tile(roundCoords, (tiles, 1, 1))[:len(middle)]
+    middleCoords[:, :, 2] = (
+        ((middle[:, np.newaxis] - 2) * layerHeight) + (I[:-1] * addition))
+
+    geo = WGeometry(topology, countsWScrew(
+        {"rounds": rounds, "segments": segments}))
+    geo.addVerts(tableCoords[:startCount])
+    geo.addVerts(middleCoords)
+    geo.addVerts(tableCoords[startCount:])
+    if not geo.topology:
+        return geo
+
+    # ...every layer is one unbroken run of IDs
+    middleCount = len(middle) * segments
+    IDs = np.full(shape, -1, dtype=np.int32)
+    IDs[present] = np.arange(len(tableCoords))
+    IDs[5:] += np.where(present[5:], middleCount, 0)
+    lengths = present.sum(axis = 1)
+    starts = present.argmax(axis = 1)
+    loops = IDs[
+        np.arange(len(IDs))[:, np.newaxis],
+        np.minimum(starts[:, np.newaxis] + I, segments)]
+
+    def column(j, i):
+        """IDs of the segment i in the layers j."""
+        inMiddle = (j >= 5) & (j < layers - 5)
+        row = np.minimum(np.searchsorted(rows, j), len(rows) - 1)
+        return np.where(
+            inMiddle, startCount + (j - 5) * segments + i, IDs[row, i])
+
+    def loop(j):
+        """IDs of the layer j."""
+        if 5 <= j < layers - 5:
+            return startCount + (j - 5) * segments + np.arange(segments)
+        row = np.searchsorted(rows, j)
+        return loops[row, :lengths[row]]
+
+    # ...creating faces
+    # .......basic loops, the neighbouring layers of the same length
+    bridged = (
+        (rows[1:] == rows[:-1] + 1) & (lengths[:-1] == lengths[1:]))
+    bridged = bridged[:, np.newaxis] & (
+        I[:-1] < lengths[:-1, np.newaxis] - 1)
+    quads = np.stack((
+        loops[:-1, :-1], loops[:-1, 1:], loops[1:, 1:], loops[1:, :-1]),
+        axis = 2)
+    geo.addFaces(quads[:4][bridged[:4]])
+
+    # .......the middle, one layer of quads repeated from the layer 4 to
+    # the layer before the end ones
+    if len(middle):
+        k = np.arange(segments - 1)
+        roundQuads = np.stack(
+            (k, k + 1, k + segments + 1, k + segments), axis = 1)
+        offsets = startCount - segments + np.arange(len(middle)) * segments
+        geo.addFaces(
+            (roundQuads + offsets[:, np.newaxis, np.newaxis]).reshape(-1, 4))
+
+    geo.addFaces(quads[4:][bridged[4:]])
+
+    # ...closure
+    closure1 = column(np.r_[0, 5:layers - 1], 0)
+    closure2 = column(np.arange(layers - 5), segments - 1)
+    geo.addFaces(bridgeLoops(closure1, closure2, False))
+
+    # ...the first and the last layers as lists, shortened below
+    ends = {}
+    for j in (0, 1, 2, 3, 4, 5, -6, -5, -4, -3, -2, -1):
+        ends[j] = ends.setdefault(j % layers, list(loop(j % layers)))
+
+    # ...Additional faces
+    geo.addFaces((
+        (0, ends[3][0], ends[4][0], ends[5][0]),
+        (0, 1, ends[3][1], ends[3][0]),
+        (1, 2, ends[1][0], ends[2][0]),
+        (1, ends[2][0], ends[3][2], ends[3][1]),
+        (ends[-6][-1], ends[-2][0], ends[-5][-1], ends[-5][-2]),
+        (ends[-5][-1], ends[-2][0], ends[-1][0], ends[-4][-1]),
+        (ends[-4][-2], ends[-4][-1], ends[-1][0], ends[-1][-1]),
+        (ends[-4][-3], ends[-4][-2], ends[-1][-1], ends[-3][-1]),
+        (ends[-3][-1], ends[-1][-1], ends[-1][-2], ends[-2][-1])))
+
+    # ...shortenLoops
+    del ends[0][:2]
+    geo.addFaces(bridgeLoops(ends[0], ends[1], False))
+    del ends[3][:2]
+    geo.addFaces(bridgeLoops(ends[2], ends[3], False))
+    del ends[-5][-1:]
+    geo.addFaces(bridgeLoops(ends[-6], ends[-5], False))
+    del ends[-4][-2:]
+    geo.addFaces(bridgeLoops(ends[-4], ends[-3], False))
+    del ends[-1][-1:]
+    geo.addFaces(bridgeLoops(ends[-2], ends[-1], False))
+
+    return geo
+
+
+def topologyWScrew(args):
+    return max(args["rounds"], 1), max(args["segments"], 4)
+
+
+def countsWScrew(args):
+    rounds, segments = topologyWScrew(args)
+    return surfaceCounts(
+        4 * (rounds + 1) * segments - 4,
+        (4 * rounds + 3) * segments - 4,
+        euler = 0)
+
+
+def vertCountWScrew(args):
+    return countsWScrew(args).verts
+
+
+def previewWScrew(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("rounds", 1), ("segments", 4)),
+        vertCountWScrew)
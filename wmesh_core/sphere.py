@@ -0,0 +1,354 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________13.08.2017______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.2_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a sphere-shaped mesh.
+"""
+
+import numpy as np
+import threading
+from collections import OrderedDict
+from math import pi
+from .geometry import (
+    WGeometry,
+    WCounts,
+    surfaceCounts,
+    circleTable,
+    cachedGeometry,
+    findEdges,
+    subdivide,
+    reduceSegments
+)
+from .bases import baseHedron
+
+# (base, level, tris) -> (verts, faces) of the unit polySphere, bounded by
+# unitSphereCacheBytes
+unitSphereCache = OrderedDict()
+unitSphereCacheBytes = 64 * 1024 * 1024
+unitSphereLock = threading.Lock()
+
+
+@cachedGeometry
+def primitive_UVSphere(
+                radius = 1.0,
+                segments = 24,
+                rings = 12,
+                topology = True):
+
+    geo = WGeometry(topology, countsWSphere(
+        {"base": "UV", "segments": segments, "rings": rings}))
+
+    # sine and cosine tables of the segments and of the rings
+    UCos, USin = circleTable(segments)
+    VAngles = np.arange(1, rings) * (pi / rings)
+    ringRadii = radius * np.sin(VAngles)
+
+    # top and bottom verts, then the rings from the bottom up
+    coords = np.empty((segments * (rings - 1) + 2, 3), dtype=np.float32)
+    coords[0] = (0.0, 0.0, radius)
+    coords[1] = (0.0, 0.0, -radius)
+    grid = coords[2:].reshape(rings - 1, segments, 3)
+    grid[:, :, 0] = np.outer(ringRadii, UCos)
+    grid[:, :, 1] = np.outer(ringRadii, USin)
+    grid[:, :, 2] = (-radius * np.cos(VAngles))[:, np.newaxis]
+    loops = geo.addVerts(coords)[2:].reshape(rings - 1, segments)
+
+    if not geo.topology:
+        return geo
+
+    # bridge the rings
+    nextIDs = np.roll(loops, -1, axis = 1)
+    geo.addFaces(np.stack((
+        loops[:-1], nextIDs[:-1], nextIDs[1:], loops[1:]),
+        axis = 2).reshape(-1, 4))
+
+    # fill top
+    geo.addFaces(np.stack(
+        (loops[-1], nextIDs[-1], np.zeros_like(loops[-1])), axis = 1))
+
+    # fill bottom
+    geo.addFaces(np.stack(
+        (nextIDs[0], loops[0], np.ones_like(loops[0])), axis = 1))
+
+    return geo
+
+
+def projectOnSphere(verts, radius):
+    return verts * (radius / np.linalg.norm(verts, axis = 1)[:, np.newaxis])
+
+
+def unitSphere(base, level, tris):
+    """
+    Verts and faces of the unit polySphere subdivided `level` times. Every
+    level is cached, so the next one is a single subdivision away.
+    """
+    if level == 0:
+        verts, edges, faces = baseHedron(base)
+        verts = projectOnSphere(np.array(verts, dtype=np.float64), 1.0)
+        return verts, np.array(faces, dtype=np.int32)
+
+    key = (base, level, tris)
+    with unitSphereLock:
+        cached = unitSphereCache.get(key)
+        if cached is not None:
+            unitSphereCache.move_to_end(key)
+            return cached
+
+    verts, faces = unitSphere(base, level - 1, tris)
+    verts, edges, faces = subdivide(verts, [], faces, tris)
+    verts = projectOnSphere(verts, 1.0)
+    verts.setflags(write = False)
+    faces.setflags(write = False)
+
+    with unitSphereLock:
+        unitSphereCache[key] = verts, faces
+        size = sum(
+            cachedVerts.nbytes + cachedFaces.nbytes
+            for cachedVerts, cachedFaces in unitSphereCache.values())
+        while size > unitSphereCacheBytes:
+            _, (oldVerts, oldFaces) = unitSphereCache.popitem(last = False)
+            size -= oldVerts.nbytes + oldFaces.nbytes
+    return verts, faces
+
+
+def clearUnitSphereCache():
+    with unitSphereLock:
+        unitSphereCache.clear()
+
+
+@cachedGeometry
+def primitive_polySphere(
+                    base = "CUBE",
+                    radius = 1.0,
+                    divisions = 2,
+                    tris = True,
+                    topology = True):
+
+    if base == "CUBE":
+        tris = False
+
+    verts, faces = unitSphere(base, divisions, tris)
+
+    geo = WGeometry(topology, countsWSphere(
+        {"base": base, "divisions": divisions, "tris": tris}))
+    geo.addVerts(verts * radius)
+    geo.addFaces(faces)
+
+    return geo
+
+
+def geodesicLattice(size, frequency):
+    """
+    Points of the frequency-N grid on a base face with `size` corners (3 or
+    4). Returns the weights of the corners for every point, the points in
+    the corners, the points inside every border (with their position along
+    it), the inner points and the faces of the grid.
+    """
+    I, J = np.indices((frequency + 1, frequency + 1)).reshape(2, -1)
+    N = frequency
+    if size == 3:
+        inside = I + J <= N
+        I, J = I[inside], J[inside]
+        u, v = I / N, J / N
+        weights = np.stack((1 - u - v, u, v), axis = 1)
+        borders = ((J == 0, I), (I + J == N, J), (I == 0, N - J))
+    else:
+        u, v = I / N, J / N
+        weights = np.stack((
+            (1 - u) * (1 - v), u * (1 - v), u * v, (1 - u) * v), axis = 1)
+        borders = (
+            (J == 0, I), (I == N, J), (J == N, N - I), (I == 0, N - J))
+
+    # border k goes from corner k to the next one
+    corners = []
+    borderPoints = []
+    onBorder = np.zeros(len(I), dtype=bool)
+    for onThis, position in borders:
+        corners.append(np.flatnonzero(onThis & (position == 0))[0])
+        points = np.flatnonzero(onThis & (position > 0) & (position < N))
+        borderPoints.append((points, position[points]))
+        onBorder |= onThis
+    innerPoints = np.flatnonzero(~onBorder)
+
+    index = np.full((N + 1, N + 1), -1, dtype=np.int32)
+    index[I, J] = np.arange(len(I))
+    if size == 3:
+        up = I + J <= N - 1
+        down = I + J <= N - 2
+        faces = np.concatenate((
+            np.stack((
+                index[I[up], J[up]],
+                index[I[up] + 1, J[up]],
+                index[I[up], J[up] + 1]), axis = 1),
+            np.stack((
+                index[I[down] + 1, J[down]],
+                index[I[down] + 1, J[down] + 1],
+                index[I[down], J[down] + 1]), axis = 1)))
+    else:
+        cell = (I < N) & (J < N)
+        faces = np.stack((
+            index[I[cell], J[cell]],
+            index[I[cell] + 1, J[cell]],
+            index[I[cell] + 1, J[cell] + 1],
+            index[I[cell], J[cell] + 1]), axis = 1)
+
+    return weights, corners, borderPoints, innerPoints, faces
+
+
+@cachedGeometry
+def primitive_geoSphere(
+                    base = "ICOSA",
+                    radius = 1.0,
+                    frequency = 4,
+                    topology = True):
+
+    if frequency < 1:
+        frequency = 1
+
+    verts, edges, faces = baseHedron(base)
+    baseVerts = projectOnSphere(np.array(verts, dtype=np.float64), 1.0)
+    baseFaces = np.array(faces, dtype=np.int32)
+    baseEdges, borders = findEdges(baseFaces)
+    size = baseFaces.shape[1]
+
+    weights, corners, borderPoints, innerPoints, latticeFaces = (
+        geodesicLattice(size, frequency))
+
+    geo = WGeometry(topology, countsWSphere(
+        {"base": base, "geodesic": True, "frequency": frequency}))
+
+    # the corners, then N - 1 verts along every edge, then the inner verts
+    # of every face, all on the flat base and projected on the sphere
+    steps = np.arange(1, frequency) / frequency
+    edgeVerts = (
+        baseVerts[baseEdges[:, 0], np.newaxis] * (1 - steps[:, np.newaxis]) +
+        baseVerts[baseEdges[:, 1], np.newaxis] * steps[:, np.newaxis])
+    innerVerts = np.einsum(
+        "pk,fkc->fpc", weights[innerPoints], baseVerts[baseFaces])
+    coords = np.concatenate((
+        baseVerts, edgeVerts.reshape(-1, 3), innerVerts.reshape(-1, 3)))
+    geo.addVerts(projectOnSphere(coords, radius))
+
+    if not geo.topology:
+        return geo
+
+    # IDs of the lattice points on every base face
+    edgeOffset = len(baseVerts)
+    innerOffset = edgeOffset + len(baseEdges) * (frequency - 1)
+    IDs = np.empty((len(baseFaces), len(weights)), dtype=np.int32)
+    for k in range(size):
+        IDs[:, corners[k]] = baseFaces[:, k]
+        points, position = borderPoints[k]
+        edge = borders[:, k, np.newaxis]
+        forward = baseEdges[borders[:, k], 0] == baseFaces[:, k]
+        IDs[:, points] = edgeOffset + edge * (frequency - 1) + np.where(
+            forward[:, np.newaxis], position - 1, frequency - 1 - position)
+    IDs[:, innerPoints] = innerOffset + (
+        np.arange(len(baseFaces))[:, np.newaxis] * len(innerPoints) +
+        np.arange(len(innerPoints)))
+
+    geo.addFaces(IDs[:, latticeFaces].reshape(-1, size))
+
+    return geo
+
+
+def primitive_Sphere(
+                radius = 1.0,
+                segments = 24,
+                rings = 12,
+                base = 3,
+                divisions = 2,
+                tris = False,
+                geodesic = False,
+                frequency = 4,
+                smoothed = True,
+                topology = True):
+
+    base = sphereBase(base)
+    if base == "UV":
+        return primitive_UVSphere(radius, segments, rings, topology)
+    if geodesic:
+        return primitive_geoSphere(base, radius, frequency, topology)
+    return primitive_polySphere(base, radius, divisions, tris, topology)
+
+
+def sphereBase(base):
+    # the setter stores the value of the enum item
+    if isinstance(base, int):
+        return ["UV", "TETRA", "CUBE", "OCTA", "ICOSA"][base - 1]
+    return base
+
+
+def topologyWSphere(args):
+    base = sphereBase(args["base"])
+    if base == "UV":
+        return base, args["segments"], args["rings"]
+    # WSpheres made before the geodesic mode have no frequency
+    if args.get("geodesic", False):
+        return base, "geodesic", max(args["frequency"], 1)
+    return base, args["divisions"], args["tris"] and base != "CUBE"
+
+
+# verts, edges, faces and the face size of the base hedra
+baseCounts = {
+    "TETRA": (4, 6, 4, 3),
+    "CUBE": (8, 12, 6, 4),
+    "OCTA": (6, 12, 8, 3),
+    "ICOSA": (12, 30, 20, 3)
+}
+
+
+def countsWSphere(args):
+    base = sphereBase(args["base"])
+    if base == "UV":
+        segments, rings = args["segments"], args["rings"]
+        return surfaceCounts(
+            segments * (rings - 1) + 2,
+            segments * (rings - 2),
+            2 * segments)
+
+    verts, edges, faces, size = baseCounts[base]
+    if args.get("geodesic", False):
+        # every edge and face of the base gets a frequency-N grid
+        N = max(args["frequency"], 1)
+        if size == 3:
+            inner = (N - 1) * (N - 2) // 2
+        else:
+            inner = (N - 1) ** 2
+        verts += edges * (N - 1) + faces * inner
+        faces *= N * N
+        return WCounts(verts, verts + faces - 2, faces, faces * size)
+
+    tris = topologyWSphere(args)[2]
+    for i in range(args["divisions"]):
+        if tris:
+            # a new vertex on every edge, 4 triangles from every triangle
+            verts, edges, faces = (
+                verts + edges, 2 * edges + 3 * faces, 4 * faces)
+        else:
+            # and one in every face, a quad for every corner
+            loops = faces * size
+            verts, edges, faces, size = (
+                verts + edges + faces, 2 * edges + loops, loops, 4)
+    return WCounts(verts, edges, faces, faces * size)
+
+
+def vertCountWSphere(args):
+    return countsWSphere(args).verts
+
+
+def previewWSphere(args, budget):
+    if sphereBase(args["base"]) == "UV":
+        return reduceSegments(
+            args, budget, (("segments", 3), ("rings", 3)), vertCountWSphere)
+    if args.get("geodesic", False):
+        return reduceSegments(
+            args, budget, (("frequency", 1),), vertCountWSphere)
+    args = dict(args)
+    while args["divisions"] > 0 and vertCountWSphere(args) > budget:
+        args["divisions"] -= 1
+    return args
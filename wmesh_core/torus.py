@@ -0,0 +1,150 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________03.04.2018______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.1_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a torus-shaped mesh.
+"""
+
+import numpy as np
+from math import pi as PI
+from .geometry import (
+                    WGeometry,
+                    surfaceCounts,
+                    circleTable,
+                    tableCoords,
+                    fanClose,
+                    bridgeLoops,
+                    cachedGeometry,
+                    reduceSegments
+)
+
+
+# Generating the vertices and polygons
+@cachedGeometry
+def primitive_Torus_ME(
+        radius_main = 2.0,
+        radius_minor = 0.5,
+        seg_main = 24,
+        seg_minor = 12,
+        sec_from = 0.0,
+        sec_to = 2 * PI,
+        smoothed = True,
+        topology = True):
+
+    # Prepare empty geometry
+    geo = WGeometry(topology, countsWTorus({
+        "radius_minor": radius_minor,
+        "seg_main": seg_main,
+        "seg_minor": seg_minor,
+        "sec_from": sec_from,
+        "sec_to": sec_to}))
+
+    # Set minimums
+    if seg_main < 3:
+        seg_main = 3
+    if seg_minor < 3:
+        seg_minor = 3
+    if sec_from > sec_to:
+        sec_from, sec_to = sec_to, sec_from
+    opened = sec_to - sec_from < 2 * PI
+
+    # The profile: distance from the axis and height of the minor circle
+    if radius_minor > 0:
+        minorCos, minorSin = circleTable(seg_minor)
+        distances = radius_main + radius_minor * minorCos
+        heights = -radius_minor * minorSin
+    else:
+        distances = np.array((radius_main,))
+        heights = np.zeros(1)
+
+    # The main angles of the loops, an open section ends with sec_to
+    mainCos, mainSin = circleTable(seg_main, sec_from, sec_to)
+
+    # Create the loops
+    loopCount = len(mainCos)
+    coords = np.empty((loopCount, len(distances), 3), dtype=np.float32)
+    coords[:, :, 0] = np.outer(mainCos, distances)
+    coords[:, :, 1] = np.outer(mainSin, distances)
+    coords[:, :, 2] = heights
+    loops = geo.addVerts(coords).reshape(loopCount, len(distances))
+
+    if opened:
+        # the cap centers at sec_to and sec_from
+        centers = geo.addVerts(tableCoords(
+            radius_main, (mainCos[[-1, 0]], mainSin[[-1, 0]])))
+
+    if not geo.topology:
+        return geo
+
+    if opened:
+        # Close caps
+        geo.addFaces(fanClose(loops[0], centers[1], flipped = True))
+        geo.addFaces(fanClose(loops[-1], centers[0]))
+    else:
+        geo.addFaces(bridgeLoops(loops[-1], loops[0], True))
+
+    # Bridge all loops
+    nextIDs = np.roll(loops, -1, axis = 1)
+    geo.addFaces(np.stack((
+        loops[:-1], nextIDs[:-1], nextIDs[1:], loops[1:]),
+        axis = 2).reshape(-1, 4))
+
+    return geo
+
+
+def torusBasis(args):
+    """
+    The vertex positions are linear in the radiuses. With `outer` the
+    torus of both radiuses 1 and `tube` the one of radius_main 0, the
+    torus of the args is radius_main * outer + (radius_minor -
+    radius_main) * tube. Both come from the geometry cache.
+    """
+    args = dict(args, radius_main = 1.0, radius_minor = 1.0)
+    args.pop("topology", None)
+    outer = primitive_Torus_ME(topology = False, **args).coords
+    args["radius_main"] = 0.0
+    tube = primitive_Torus_ME(topology = False, **args).coords
+    return outer, tube
+
+
+def topologyWTorus(args):
+    return (
+        max(args["seg_main"], 3),
+        max(args["seg_minor"], 3),
+        abs(args["sec_to"] - args["sec_from"]) < 2 * PI,
+        args["radius_minor"] > 0)
+
+
+def countsWTorus(args):
+    seg_main, seg_minor, open_sector, rounded = topologyWTorus(args)
+
+    # a zero minor radius collapses every loop into one vertex
+    loopVerts = seg_minor if rounded else 1
+    if open_sector:
+        counts = surfaceCounts(
+            (seg_main + 1) * loopVerts + 2,
+            seg_main * loopVerts,
+            2 * loopVerts)
+        if not rounded:
+            counts = counts._replace(edges = counts.verts - 1)
+    else:
+        counts = surfaceCounts(
+            seg_main * loopVerts, seg_main * loopVerts, euler = 0)
+        if not rounded:
+            counts = counts._replace(edges = seg_main)
+    return counts
+
+
+def vertCountWTorus(args):
+    return countsWTorus(args).verts
+
+
+def previewWTorus(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_main", 3), ("seg_minor", 3)),
+        vertCountWTorus)
@@ -0,0 +1,217 @@
+# __________________________________/
+# __Author:_________Vit_Prochazka___/
+# __Created:________16.12.2015______/
+# __Last_modified:__21.08.2018______/
+# __Version:________0.3_____________/
+# __________________________________/
+
+"""
+Generates the geometry of a tube-shaped mesh.
+"""
+
+import numpy as np
+from math import pi
+from .geometry import (
+    WGeometry,
+    surfaceCounts,
+    circleTable,
+    ringCoords,
+    circleCoords,
+    bridgeStrip,
+    fanClose,
+    moveVerts,
+    cachedGeometry,
+    reduceSegments
+)
+
+
+@cachedGeometry
+def primitive_Tube(
+                radius_out = 1.0,
+                radius_in = 0.0,
+                height = 2.0,
+                use_inner = True,
+                seg_perimeter = 24,
+                seg_radius = 1,
+                seg_height = 1,
+                sector_from = 0.0,
+                sector_to = 2 * pi,
+                centered = True,
+                smoothed = True,
+                topology = True):
+
+    geo = WGeometry(topology, countsWTube({
+        "radius_out": radius_out,
+        "radius_in": radius_in,
+        "use_inner": use_inner,
+        "seg_perimeter": seg_perimeter,
+        "seg_radius": seg_radius,
+        "seg_height": seg_height,
+        "sector_from": sector_from,
+        "sector_to": sector_to}))
+
+    # make sure of what is bigger
+    if radius_out < radius_in:
+        radius_in, radius_out = radius_out, radius_in
+
+    if sector_from > sector_to:
+        sector_to, sector_from = sector_from, sector_to
+
+    if radius_out - radius_in < 0.0001:
+        use_inner = False
+
+    if seg_perimeter < 3:
+        seg_perimeter = 3
+
+    # sizes of chunks
+    stepRadius = (radius_out - radius_in) / seg_radius
+    stepHeight = height / seg_height
+
+    middlePoint = radius_in <= 0.0001
+    closed = (sector_to - sector_from) >= 2 * pi
+    table = circleTable(seg_perimeter, sector_from, sector_to)
+    loopVerts = len(table[0])
+    rad_number = seg_radius
+    if middlePoint:
+        rad_number = seg_radius - 1
+
+    # wall around, every loop scaled from the same unit ring
+    loops = geo.addVerts(ringCoords(
+        radius_out, table, np.arange(seg_height + 1) * stepHeight))
+    loops = loops.reshape(-1, loopVerts)
+    geo.addFaces(bridgeStrip(loops, closed))
+
+    if use_inner:
+        # the caps (without the center), rows from the outer loop inwards
+        capRadii = radius_out - (np.arange(rad_number) + 1) * stepRadius
+        bottom_rings = geo.addVerts(ringCoords(capRadii, table, 0.0))
+        top_rings = geo.addVerts(ringCoords(capRadii, table, height))
+        bottom_rings = np.vstack(
+            (loops[:1], bottom_rings.reshape(-1, loopVerts)))
+        top_rings = np.vstack((loops[-1:], top_rings.reshape(-1, loopVerts)))
+        geo.addFaces(bridgeStrip(top_rings, closed))
+        geo.addFaces(bridgeStrip(bottom_rings[::-1], closed))
+
+        # fill the center
+        if middlePoint:
+            # fill with middle point
+            if closed:
+                midpoints = geo.addVerts(((0.0, 0.0, 0.0), (0.0, 0.0, height)))
+            else:
+                centerLine = np.zeros((seg_height + 1, 3), dtype=np.float32)
+                centerLine[:, 2] = np.arange(seg_height + 1) * stepHeight
+                midpoints = geo.addVerts(centerLine)
+
+            # close the cup
+            cups = np.stack((
+                fanClose(
+                    bottom_rings[-1], midpoints[0],
+                    closed = False, flipped = True),
+                fanClose(top_rings[-1], midpoints[-1], closed = False)),
+                axis = 1)
+            geo.addFaces(cups.reshape(-1, 3))
+            if closed:
+                geo.addFaces((
+                    (bottom_rings[-1][-1], midpoints[0], bottom_rings[-1][0]),
+                    (top_rings[-1][-1], top_rings[-1][0], midpoints[-1])))
+            centerLines = midpoints, midpoints
+
+        else:
+            # fill with inner loops
+            inner_loops = geo.addVerts(ringCoords(
+                radius_in, table, np.arange(1, seg_height) * stepHeight))
+            inner_loops = np.vstack((
+                bottom_rings[-1:],
+                inner_loops.reshape(-1, loopVerts),
+                top_rings[-1:]))
+            geo.addFaces(bridgeStrip(inner_loops[::-1], closed))
+            centerLines = inner_loops[:, 0], inner_loops[:, -1]
+
+        # fill the walls, lines from the outer wall to the center
+        if not closed:
+            lineCount = seg_radius - 1
+            lineRadii = radius_out - (np.arange(lineCount) + 1) * stepRadius
+            lineHeights = np.arange(1, seg_height) * stepHeight
+            # both walls in one block, wall by wall, line by line
+            lineLength = lineCount * (seg_height - 1)
+            lineIDs = geo.addVerts(circleCoords(
+                np.tile(np.repeat(lineRadii, seg_height - 1), 2),
+                np.repeat((sector_from, sector_to), lineLength),
+                np.tile(lineHeights, 2 * lineCount)))
+            lineIDs = lineIDs.reshape(2, lineCount, seg_height - 1)
+
+            for side, wall in enumerate((0, -1)):
+                lines = np.vstack((
+                    loops[:, wall],
+                    np.column_stack((
+                        bottom_rings[1:lineCount + 1, wall],
+                        lineIDs[side],
+                        top_rings[1:lineCount + 1, wall])),
+                    centerLines[side]))
+                # the second wall is bridged backwards to face outside
+                if side == 1:
+                    lines = lines[::-1]
+                geo.addFaces(bridgeStrip(lines, False))
+
+    if centered:
+        moveVerts(geo.coords, (0.0, 0.0, -height / 2))
+
+    return geo
+
+
+def topologyWTube(args):
+    radius_in = min(args["radius_out"], args["radius_in"])
+    thickness = abs(args["radius_out"] - args["radius_in"])
+    sector = abs(args["sector_to"] - args["sector_from"])
+    return (
+        max(args["seg_perimeter"], 3),
+        args["seg_radius"],
+        args["seg_height"],
+        args["use_inner"] and thickness >= 0.0001,
+        radius_in <= 0.0001,
+        sector >= 2 * pi)
+
+
+def countsWTube(args):
+    seg_perimeter, seg_radius, seg_height, use_inner, middlePoint, closed = (
+        topologyWTube(args))
+    loopVerts = seg_perimeter + (not closed)
+
+    # wall around
+    verts = (seg_height + 1) * loopVerts
+    quads = seg_height * seg_perimeter
+    tris = 0
+    if not use_inner:
+        return surfaceCounts(verts, quads, euler = 0 if closed else 1)
+
+    # caps
+    rad_number = seg_radius - middlePoint
+    verts += 2 * rad_number * loopVerts
+    quads += 2 * rad_number * seg_perimeter
+
+    # center
+    if middlePoint:
+        verts += 2 if closed else seg_height + 1
+        tris = 2 * seg_perimeter
+    else:
+        verts += (seg_height - 1) * loopVerts
+        quads += seg_height * seg_perimeter
+
+    # walls
+    if not closed:
+        verts += 2 * (seg_radius - 1) * (seg_height - 1)
+        quads += 2 * seg_radius * seg_height
+
+    return surfaceCounts(
+        verts, quads, tris, euler = 2 if middlePoint or not closed else 0)
+
+
+def vertCountWTube(args):
+    return countsWTube(args).verts
+
+
+def previewWTube(args, budget):
+    return reduceSegments(
+        args, budget,
+        (("seg_perimeter", 3), ("seg_height", 1), ("seg_radius", 1)),
+        vertCountWTube)